@@ -8,7 +8,7 @@ from sqlalchemy import pool
 from alembic import context
 
 # Import models to ensure they're registered
-from app.database import Base
+from app.database import Base, DATABASE_URL
 from app.models import account, category, transaction, budget
 
 # this is the Alembic Config object
@@ -16,7 +16,13 @@ config = context.config
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
-    fileConfig(config.config_file_name)
+    # Keep the app's loggers working when migrations run from the lifespan
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+# Always migrate the database the app's engine uses (DATABASE_PATH or the production
+# app-data path); alembic.ini's url is only the development default.
+# '%' is escaped for the ini file's interpolation.
+config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
 
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
@@ -0,0 +1,45 @@
+"""Add composite index for active income schedules by next date
+
+Revision ID: 005_income_schedule_active_index
+Revises: 004_add_income_schedules
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '005_income_schedule_active_index'
+down_revision = '004_add_income_schedules'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_income_schedules_active_next_date'
+
+
+def upgrade():
+    """Create (is_active, next_expected_date) index on income_schedules"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'income_schedules' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('income_schedules')]
+    if INDEX_NAME not in existing_indexes:
+        op.create_index(INDEX_NAME, 'income_schedules', ['is_active', 'next_expected_date'], unique=False)
+
+
+def downgrade():
+    """Drop (is_active, next_expected_date) index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'income_schedules' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('income_schedules')]
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name='income_schedules')
@@ -0,0 +1,55 @@
+"""Add composite index for import duplicate checks
+
+Revision ID: 006_transaction_duplicate_index
+Revises: 005_income_schedule_active_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '006_transaction_duplicate_index'
+down_revision = '005_income_schedule_active_index'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_transactions_dup_check'
+
+
+def upgrade():
+    """Create (account_id, transaction_date, amount, transaction_type) index on transactions"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    if INDEX_NAME not in existing_indexes:
+        op.create_index(
+            INDEX_NAME, 'transactions',
+            ['account_id', 'transaction_date', 'amount', 'transaction_type'],
+            unique=False
+        )
+    
+    # The composite index starts with account_id, so the single-column one is redundant
+    if 'ix_transactions_account_id' in existing_indexes:
+        op.drop_index('ix_transactions_account_id', table_name='transactions')
+
+
+def downgrade():
+    """Restore the account_id index and drop the duplicate-check index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    if 'ix_transactions_account_id' not in existing_indexes:
+        op.create_index('ix_transactions_account_id', 'transactions', ['account_id'], unique=False)
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name='transactions')
@@ -0,0 +1,49 @@
+"""Add composite index for report aggregations
+
+Revision ID: 007_transaction_report_index
+Revises: 006_transaction_duplicate_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '007_transaction_report_index'
+down_revision = '006_transaction_duplicate_index'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_transactions_type_date_category'
+
+
+def upgrade():
+    """Create (transaction_type, transaction_date, category_id, amount) index on transactions"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    if INDEX_NAME not in existing_indexes:
+        op.create_index(
+            INDEX_NAME, 'transactions',
+            ['transaction_type', 'transaction_date', 'category_id', 'amount'],
+            unique=False
+        )
+
+
+def downgrade():
+    """Drop the report aggregation index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name='transactions')
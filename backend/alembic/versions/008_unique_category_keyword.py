@@ -0,0 +1,59 @@
+"""Make category keyword text unique
+
+Revision ID: 008_unique_category_keyword
+Revises: 007_transaction_report_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+from app.database_fixes import delete_duplicate_keywords
+
+
+# revision identifiers, used by Alembic.
+revision = '008_unique_category_keyword'
+down_revision = '007_transaction_report_index'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_category_keywords_keyword'
+
+
+def upgrade():
+    """Drop duplicate keywords and make the keyword index unique"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'category_keywords' not in inspector.get_table_names():
+        return
+    
+    indexes = {ix['name']: ix for ix in inspector.get_indexes('category_keywords')}
+    if INDEX_NAME in indexes and indexes[INDEX_NAME]['unique']:
+        return
+    
+    # Same dedupe as the startup health check, on this migration's connection
+    cursor = conn.connection.cursor()
+    try:
+        delete_duplicate_keywords(cursor)
+    finally:
+        cursor.close()
+    
+    if INDEX_NAME in indexes:
+        op.drop_index(INDEX_NAME, table_name='category_keywords')
+    op.create_index(INDEX_NAME, 'category_keywords', ['keyword'], unique=True)
+
+
+def downgrade():
+    """Restore the non-unique keyword index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'category_keywords' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('category_keywords')]
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name='category_keywords')
+    op.create_index(INDEX_NAME, 'category_keywords', ['keyword'], unique=False)
@@ -0,0 +1,60 @@
+"""Make the report index covering and add an uncategorized partial index
+
+Revision ID: 009_transaction_report_covering
+Revises: 008_unique_category_keyword
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision = '009_transaction_report_covering'
+down_revision = '008_unique_category_keyword'
+branch_labels = None
+depends_on = None
+
+
+REPORT_INDEX = 'ix_transactions_type_date_category'
+UNCATEGORIZED_INDEX = 'ix_transactions_uncategorized'
+REPORT_COLUMNS = ['transaction_type', 'transaction_date', 'category_id', 'amount', 'account_id']
+
+
+def upgrade():
+    """Append account_id to the report index and create the partial uncategorized index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    indexes = {ix['name']: ix for ix in inspector.get_indexes('transactions')}
+    
+    if REPORT_INDEX in indexes and indexes[REPORT_INDEX]['column_names'] != REPORT_COLUMNS:
+        op.drop_index(REPORT_INDEX, table_name='transactions')
+        del indexes[REPORT_INDEX]
+    if REPORT_INDEX not in indexes:
+        op.create_index(REPORT_INDEX, 'transactions', REPORT_COLUMNS, unique=False)
+    
+    if UNCATEGORIZED_INDEX not in indexes:
+        op.create_index(
+            UNCATEGORIZED_INDEX, 'transactions', ['transaction_type'],
+            unique=False, sqlite_where=text('category_id IS NULL')
+        )
+
+
+def downgrade():
+    """Drop the partial index and restore the four-column report index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    if UNCATEGORIZED_INDEX in existing_indexes:
+        op.drop_index(UNCATEGORIZED_INDEX, table_name='transactions')
+    if REPORT_INDEX in existing_indexes:
+        op.drop_index(REPORT_INDEX, table_name='transactions')
+    op.create_index(REPORT_INDEX, 'transactions', REPORT_COLUMNS[:4], unique=False)
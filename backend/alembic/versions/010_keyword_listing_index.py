@@ -0,0 +1,45 @@
+"""Add index for the keyword listing order
+
+Revision ID: 010_keyword_listing_index
+Revises: 009_transaction_report_covering
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect, text
+
+
+# revision identifiers, used by Alembic.
+revision = '010_keyword_listing_index'
+down_revision = '009_transaction_report_covering'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_category_keywords_priority_keyword'
+
+
+def upgrade():
+    """Create (priority DESC, keyword) index on category_keywords"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'category_keywords' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('category_keywords')]
+    if INDEX_NAME not in existing_indexes:
+        op.create_index(INDEX_NAME, 'category_keywords', [text('priority DESC'), 'keyword'], unique=False)
+
+
+def downgrade():
+    """Drop the keyword listing index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'category_keywords' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('category_keywords')]
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name='category_keywords')
@@ -0,0 +1,44 @@
+"""Add categorization_version to transactions
+
+Revision ID: 011_categorization_version
+Revises: 010_keyword_listing_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '011_categorization_version'
+down_revision = '010_keyword_listing_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the nullable categorization_version column"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    columns = [col['name'] for col in inspector.get_columns('transactions')]
+    if 'categorization_version' not in columns:
+        op.add_column('transactions', sa.Column('categorization_version', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    """Drop the categorization_version column"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    columns = [col['name'] for col in inspector.get_columns('transactions')]
+    if 'categorization_version' in columns:
+        with op.batch_alter_table('transactions') as batch_op:
+            batch_op.drop_column('categorization_version')
@@ -0,0 +1,56 @@
+"""Add date-ordered composite indexes for the transaction list filters
+
+Revision ID: 012_transaction_filter_indexes
+Revises: 011_categorization_version
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '012_transaction_filter_indexes'
+down_revision = '011_categorization_version'
+branch_labels = None
+depends_on = None
+
+
+# Composite index name -> (filter column, single-column index it replaces)
+FILTER_INDEXES = {
+    'ix_transactions_from_account_date': ('from_account_id', 'ix_transactions_from_account_id'),
+    'ix_transactions_to_account_date': ('to_account_id', 'ix_transactions_to_account_id'),
+    'ix_transactions_category_date': ('category_id', 'ix_transactions_category_id'),
+}
+
+
+def upgrade():
+    """Create (column, transaction_date) indexes and drop the single-column ones they cover"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    for index_name, (column, old_index) in FILTER_INDEXES.items():
+        if index_name not in existing_indexes:
+            op.create_index(index_name, 'transactions', [column, 'transaction_date'], unique=False)
+        if old_index in existing_indexes:
+            op.drop_index(old_index, table_name='transactions')
+
+
+def downgrade():
+    """Restore the single-column indexes and drop the composite ones"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    for index_name, (column, old_index) in FILTER_INDEXES.items():
+        if old_index not in existing_indexes:
+            op.create_index(old_index, 'transactions', [column], unique=False)
+        if index_name in existing_indexes:
+            op.drop_index(index_name, table_name='transactions')
@@ -0,0 +1,79 @@
+"""Add an FTS5 trigram index over transaction payee and description
+
+Revision ID: 013_transaction_search_index
+Revises: 012_transaction_filter_indexes
+Create Date: 2026-10-16
+
+"""
+import logging
+
+from alembic import op
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+
+
+# revision identifiers, used by Alembic.
+revision = '013_transaction_search_index'
+down_revision = '012_transaction_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'transactions_fts'
+TRIGGERS = ['transactions_fts_insert', 'transactions_fts_delete', 'transactions_fts_update']
+
+
+def upgrade():
+    """Create the external-content FTS table, keep it in sync with triggers, and fill it"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    table_names = inspector.get_table_names()
+    if 'transactions' not in table_names or FTS_TABLE in table_names:
+        return
+    
+    # Trigram tokens match any substring of 3+ characters, like the ILIKE search it replaces
+    try:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "payee, description, content='transactions', content_rowid='id', tokenize='trigram')"
+        ))
+    except OperationalError as e:
+        # SQLite built without FTS5 (or older than 3.34): search keeps using ILIKE
+        logger.warning(f"Transaction search index not created: {e}")
+        return
+    
+    conn.execute(text(f"""
+        CREATE TRIGGER transactions_fts_insert AFTER INSERT ON transactions BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, payee, description)
+            VALUES (new.id, new.payee, new.description);
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER transactions_fts_delete AFTER DELETE ON transactions BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, payee, description)
+            VALUES ('delete', old.id, old.payee, old.description);
+        END
+    """))
+    conn.execute(text(f"""
+        CREATE TRIGGER transactions_fts_update AFTER UPDATE OF payee, description ON transactions BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, payee, description)
+            VALUES ('delete', old.id, old.payee, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, payee, description)
+            VALUES (new.id, new.payee, new.description);
+        END
+    """))
+    
+    # Index the rows that already exist
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def downgrade():
+    """Drop the sync triggers and the FTS table"""
+    conn = op.get_bind()
+    
+    for trigger in TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
@@ -0,0 +1,51 @@
+"""Make the category/date transaction index cover amount
+
+Revision ID: 014_category_date_covering
+Revises: 013_transaction_search_index
+Create Date: 2026-10-16
+
+"""
+from alembic import op
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision = '014_category_date_covering'
+down_revision = '013_transaction_search_index'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'ix_transactions_category_date'
+INDEX_COLUMNS = ['category_id', 'transaction_date', 'amount']
+
+
+def upgrade():
+    """Recreate ix_transactions_category_date with amount appended"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    indexes = {ix['name']: ix for ix in inspector.get_indexes('transactions')}
+    
+    if INDEX_NAME in indexes and indexes[INDEX_NAME]['column_names'] != INDEX_COLUMNS:
+        op.drop_index(INDEX_NAME, table_name='transactions')
+        del indexes[INDEX_NAME]
+    if INDEX_NAME not in indexes:
+        op.create_index(INDEX_NAME, 'transactions', INDEX_COLUMNS, unique=False)
+
+
+def downgrade():
+    """Restore the two-column category/date index"""
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    
+    if 'transactions' not in inspector.get_table_names():
+        return
+    
+    existing_indexes = [ix['name'] for ix in inspector.get_indexes('transactions')]
+    if INDEX_NAME in existing_indexes:
+        op.drop_index(INDEX_NAME, table_name='transactions')
+    op.create_index(INDEX_NAME, 'transactions', INDEX_COLUMNS[:2], unique=False)
@@ -1,14 +1,14 @@
 """Budget API endpoints"""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Optional
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, case, func
+from typing import Dict, List, Optional, Tuple
 from datetime import date
 
 from app.database import get_db
 from app.schemas.budget import BudgetCreate, BudgetUpdate, BudgetResponse, BudgetWithProgress
-from app.models.budget import Budget, BudgetPeriod
+from app.models.budget import Budget, BudgetPeriod, PeriodBoundaries
 from app.models.transaction import Transaction, TransactionType
 from app.models.category import Category
 
@@ -22,10 +22,10 @@ def get_budgets(
     db: Session = Depends(get_db)
 ):
     """Get all budgets"""
-    query = db.query(Budget)
+    query = db.query(Budget).options(selectinload(Budget.categories))
     
     if is_active is not None:
-        query = query.filter(Budget.is_active == (1 if is_active else 0))
+        query = query.filter(Budget.is_active == is_active)
     
     if category_id:
         # Filter budgets that include this category
@@ -33,7 +33,8 @@ def get_budgets(
     
     budgets = query.order_by(Budget.name).all()
     
-    # Convert to response format with category_ids
+    # Convert to response format with category_ids; rows come from the database, so
+    # build the models without validation (FastAPI still checks the response once)
     result = []
     for budget in budgets:
         budget_dict = {
@@ -44,17 +45,52 @@ def get_budgets(
             "period_type": budget.period_type,
             "start_date": budget.start_date,
             "end_date": budget.end_date,
-            "allow_rollover": bool(budget.allow_rollover),
+            "allow_rollover": budget.allow_rollover,
             "rollover_amount": budget.rollover_amount,
-            "is_active": bool(budget.is_active),
+            "is_active": budget.is_active,
             "created_at": budget.created_at,
             "updated_at": budget.updated_at,
         }
-        result.append(BudgetResponse(**budget_dict))
+        result.append(BudgetResponse.model_construct(**budget_dict))
     
     return result
 
 
+def get_spent_by_budget(
+    db: Session,
+    scopes: Dict[int, Tuple[PeriodBoundaries, List[int]]]
+) -> Dict[int, float]:
+    """
+    Expense totals per budget, given {budget_id: ((period_start, period_end), category_ids)}.
+    One conditional SUM per budget in a single pass over the combined date range.
+    """
+    if not scopes:
+        return {}
+    
+    budget_ids = list(scopes)
+    sums = [
+        func.sum(case(
+            (and_(
+                Transaction.category_id.in_(category_ids),
+                Transaction.transaction_date >= period_start,
+                Transaction.transaction_date <= period_end
+            ), Transaction.amount),
+            else_=0.0
+        ))
+        for (period_start, period_end), category_ids in scopes.values()
+    ]
+    
+    all_category_ids = sorted({category_id for _, category_ids in scopes.values() for category_id in category_ids})
+    row = db.query(*sums).filter(
+        Transaction.transaction_type == TransactionType.EXPENSE,
+        Transaction.category_id.in_(all_category_ids),
+        Transaction.transaction_date >= min(period.start for period, _ in scopes.values()),
+        Transaction.transaction_date <= max(period.end for period, _ in scopes.values())
+    ).one()
+    
+    return {budget_id: spent or 0.0 for budget_id, spent in zip(budget_ids, row)}
+
+
 @router.get("/progress", response_model=List[BudgetWithProgress])
 def get_budgets_with_progress(
     reference_date: Optional[date] = Query(None),
@@ -64,25 +100,21 @@ def get_budgets_with_progress(
     if reference_date is None:
         reference_date = date.today()
     
-    budgets = db.query(Budget).filter(Budget.is_active == 1).all()
+    budgets = db.query(Budget).options(selectinload(Budget.categories)).filter(Budget.is_active == True).all()
     result = []
     
+    # Period boundaries and categories for every budget, then all spent totals in one query
+    scopes = {
+        budget.id: (budget.get_period_boundaries(reference_date), [cat.id for cat in budget.categories])
+        for budget in budgets
+    }
+    spent_by_budget = get_spent_by_budget(db, scopes)
+    
     for budget in budgets:
-        # Get period boundaries
-        period_start, period_end = budget.get_period_boundaries(reference_date)
-        
-        # Get all category IDs for this budget
-        category_ids = [cat.id for cat in budget.categories]
+        (period_start, period_end), category_ids = scopes[budget.id]
         
-        # Calculate spent amount across all linked categories
-        spent = db.query(func.sum(Transaction.amount)).filter(
-            and_(
-                Transaction.category_id.in_(category_ids),
-                Transaction.transaction_type == TransactionType.EXPENSE,
-                Transaction.transaction_date >= period_start,
-                Transaction.transaction_date <= period_end
-            )
-        ).scalar() or 0.0
+        # Spent amount across all linked categories
+        spent = spent_by_budget[budget.id]
         
         # Calculate remaining and percentage
         total_budget = budget.amount + budget.rollover_amount
@@ -97,9 +129,9 @@ def get_budgets_with_progress(
             "period_type": budget.period_type,
             "start_date": budget.start_date,
             "end_date": budget.end_date,
-            "allow_rollover": bool(budget.allow_rollover),
+            "allow_rollover": budget.allow_rollover,
             "rollover_amount": budget.rollover_amount,
-            "is_active": bool(budget.is_active),
+            "is_active": budget.is_active,
             "created_at": budget.created_at,
             "updated_at": budget.updated_at,
             "spent": spent,
@@ -108,7 +140,7 @@ def get_budgets_with_progress(
             "period_start": period_start,
             "period_end": period_end,
         }
-        result.append(BudgetWithProgress(**budget_dict))
+        result.append(BudgetWithProgress.model_construct(**budget_dict))
     
     return result
 
@@ -129,9 +161,9 @@ def get_budget(budget_id: int, db: Session = Depends(get_db)):
         "period_type": budget.period_type,
         "start_date": budget.start_date,
         "end_date": budget.end_date,
-        "allow_rollover": bool(budget.allow_rollover),
+        "allow_rollover": budget.allow_rollover,
         "rollover_amount": budget.rollover_amount,
-        "is_active": bool(budget.is_active),
+        "is_active": budget.is_active,
         "created_at": budget.created_at,
         "updated_at": budget.updated_at,
     }
@@ -154,9 +186,9 @@ def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
         amount=budget.amount,
         period_type=budget.period_type,
         start_date=budget.start_date,
-        allow_rollover=1 if budget.allow_rollover else 0,
+        allow_rollover=budget.allow_rollover,
         rollover_amount=0.0,
-        is_active=1
+        is_active=True
     )
     
     # Link categories
@@ -174,9 +206,9 @@ def create_budget(budget: BudgetCreate, db: Session = Depends(get_db)):
         "period_type": db_budget.period_type,
         "start_date": db_budget.start_date,
         "end_date": db_budget.end_date,
-        "allow_rollover": bool(db_budget.allow_rollover),
+        "allow_rollover": db_budget.allow_rollover,
         "rollover_amount": db_budget.rollover_amount,
-        "is_active": bool(db_budget.is_active),
+        "is_active": db_budget.is_active,
         "created_at": db_budget.created_at,
         "updated_at": db_budget.updated_at,
     }
@@ -208,10 +240,7 @@ def update_budget(
         db_budget.categories = categories
     
     for field, value in update_data.items():
-        if field in ["allow_rollover", "is_active"] and isinstance(value, bool):
-            setattr(db_budget, field, 1 if value else 0)
-        else:
-            setattr(db_budget, field, value)
+        setattr(db_budget, field, value)
     
     db.commit()
     db.refresh(db_budget)
@@ -224,9 +253,9 @@ def update_budget(
         "period_type": db_budget.period_type,
         "start_date": db_budget.start_date,
         "end_date": db_budget.end_date,
-        "allow_rollover": bool(db_budget.allow_rollover),
+        "allow_rollover": db_budget.allow_rollover,
         "rollover_amount": db_budget.rollover_amount,
-        "is_active": bool(db_budget.is_active),
+        "is_active": db_budget.is_active,
         "created_at": db_budget.created_at,
         "updated_at": db_budget.updated_at,
     }
@@ -7,7 +7,8 @@ from typing import List, Optional
 from app.database import get_db
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithSubcategories
 from app.models.category import Category, CategoryType
-from app.seed.categories import get_preset_categories
+from app.seed.categories import insert_preset_categories
+from app.api.imports import invalidate_categorizer_cache
 
 router = APIRouter()
 
@@ -82,37 +83,10 @@ def reset_categories(db: Session = Depends(get_db)):
         db.commit()
         
         # Recreate preset categories
-        preset_categories = get_preset_categories()
-        categories_created = 0
-        
-        for cat_data in preset_categories:
-            parent_cat = Category(
-                name=cat_data["name"],
-                category_type=cat_data["category_type"],
-                is_system=cat_data["is_system"],
-                color=cat_data.get("color"),
-                icon=cat_data.get("icon"),
-                is_active=True
-            )
-            db.add(parent_cat)
-            db.flush()  # Get parent ID
-            categories_created += 1
-            
-            # Add subcategories
-            for subcat_data in cat_data.get("subcategories", []):
-                sub_cat = Category(
-                    name=subcat_data["name"],
-                    category_type=cat_data["category_type"],
-                    parent_id=parent_cat.id,
-                    is_system=cat_data["is_system"],
-                    color=subcat_data.get("color"),
-                    icon=subcat_data.get("icon"),
-                    is_active=True
-                )
-                db.add(sub_cat)
-                categories_created += 1
+        categories_created = insert_preset_categories(db)
         
         db.commit()
+        invalidate_categorizer_cache()
         
         return {
             "success": True,
@@ -132,6 +106,7 @@ def delete_all_categories(db: Session = Depends(get_db)):
         subcats_deleted = db.query(Category).filter(Category.parent_id != None).delete(synchronize_session=False)
         parents_deleted = db.query(Category).filter(Category.parent_id == None).delete(synchronize_session=False)
         db.commit()
+        invalidate_categorizer_cache()
         
         total_deleted = subcats_deleted + parents_deleted
         return {
@@ -160,6 +135,7 @@ def delete_categories_by_type(category_type: CategoryType, db: Session = Depends
         ).delete(synchronize_session=False)
         
         db.commit()
+        invalidate_categorizer_cache()
         
         total_deleted = subcats_deleted + parents_deleted
         return {
@@ -209,6 +185,7 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     
     db.add(db_category)
     db.commit()
+    invalidate_categorizer_cache()
     db.refresh(db_category)
     
     return db_category
@@ -236,6 +213,7 @@ def update_category(
         setattr(db_category, field, value)
     
     db.commit()
+    invalidate_categorizer_cache()
     db.refresh(db_category)
     
     return db_category
@@ -263,9 +241,11 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         # Soft delete
         db_category.is_active = False
         db.commit()
+        invalidate_categorizer_cache()
         return {"message": "Category marked as inactive"}
     else:
         # Hard delete if no dependencies
         db.delete(db_category)
         db.commit()
+        invalidate_categorizer_cache()
         return {"message": "Category deleted"}
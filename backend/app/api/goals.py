@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, case, func, or_
 from typing import List, Optional
 from datetime import date
 
@@ -49,14 +49,18 @@ def get_goals_with_progress(
     
     goals = query.order_by(Goal.priority.desc(), Goal.target_date).all()
     
+    # One date for the whole response
+    today = date.today()
+    
     result = []
     for goal in goals:
-        goal_progress = GoalWithProgress(
+        # Trusted database values; skip validating them on construction
+        goal_progress = GoalWithProgress.model_construct(
             **goal.__dict__,
             progress_percentage=round(goal.progress_percentage, 2),
             remaining_amount=goal.remaining_amount,
-            days_remaining=goal.days_remaining,
-            days_elapsed=goal.days_elapsed
+            days_remaining=goal.days_remaining_on(today),
+            days_elapsed=goal.days_elapsed_on(today)
         )
         result.append(goal_progress)
     
@@ -66,28 +70,30 @@ def get_goals_with_progress(
 @router.get("/summary")
 def get_goals_summary(db: Session = Depends(get_db)):
     """Get summary statistics for all goals"""
-    goals = db.query(Goal).all()
-    
-    active_goals = [g for g in goals if g.status in [GoalStatus.IN_PROGRESS, GoalStatus.NOT_STARTED]]
-    completed_goals = [g for g in goals if g.status == GoalStatus.COMPLETED]
-    
-    total_target = sum(g.target_amount for g in active_goals)
-    total_saved = sum(g.current_amount for g in active_goals)
-    total_remaining = sum(g.remaining_amount for g in active_goals)
-    
-    # Calculate average progress
-    avg_progress = 0.0
-    if active_goals:
-        avg_progress = sum(g.progress_percentage for g in active_goals) / len(active_goals)
+    is_active = Goal.status.in_([GoalStatus.IN_PROGRESS, GoalStatus.NOT_STARTED])
+    
+    # All totals in one aggregate; the hybrid properties compile to SQL here
+    (
+        total_goals, active_goals, completed_goals,
+        total_target, total_saved, total_remaining, avg_progress
+    ) = db.query(
+        func.count(Goal.id),
+        func.count(case((is_active, 1))),
+        func.count(case((Goal.status == GoalStatus.COMPLETED, 1))),
+        func.sum(case((is_active, Goal.target_amount), else_=0.0)),
+        func.sum(case((is_active, Goal.current_amount), else_=0.0)),
+        func.sum(case((is_active, Goal.remaining_amount), else_=0.0)),
+        func.avg(case((is_active, Goal.progress_percentage)))  # NULL for inactive goals
+    ).one()
     
     return {
-        "total_goals": len(goals),
-        "active_goals": len(active_goals),
-        "completed_goals": len(completed_goals),
-        "total_target_amount": total_target,
-        "total_saved_amount": total_saved,
-        "total_remaining_amount": total_remaining,
-        "average_progress": round(avg_progress, 2)
+        "total_goals": total_goals,
+        "active_goals": active_goals,
+        "completed_goals": completed_goals,
+        "total_target_amount": total_target or 0.0,
+        "total_saved_amount": total_saved or 0.0,
+        "total_remaining_amount": total_remaining or 0.0,
+        "average_progress": round(avg_progress or 0.0, 2)
     }
 
 
@@ -1,26 +1,54 @@
 """Bank transaction import API endpoints"""
 
+import codecs
 import csv
+import functools
+import hashlib
 import io
+import logging
+import operator
+import os
 import re
-from datetime import datetime, date
-from typing import List, Optional, Dict, Tuple
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy.orm import Session
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+import zlib
+from datetime import datetime, date, timedelta
+from itertools import compress
+from types import MappingProxyType
+from typing import BinaryIO, Callable, List, Mapping, Optional, Dict, TextIO, Tuple
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, UploadFile, File, Form
+from sqlalchemy.orm import Session, aliased, joinedload
 from pydantic import BaseModel
 
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from app.models.transaction import Transaction, TransactionType
-from app.models.account import Account
+from app.models.account import Account, AccountType
 from app.models.category import Category, CategoryType
 from app.models.category_keyword import CategoryKeyword
 
-router = APIRouter()
+try:
+    import ahocorasick
+except ImportError:  # Fall back to a linear substring scan
+    ahocorasick = None
+
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    from fastapi.responses import ORJSONResponse as ImportJSONResponse
+except ImportError:  # Fall back to the standard JSON encoder
+    from fastapi.responses import JSONResponse as ImportJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Previews can hold thousands of rows, so serialize responses with orjson when available
+router = APIRouter(default_response_class=ImportJSONResponse)
 
 
 # Keyword patterns for auto-categorization
 # Maps keywords (lowercase) to (parent_category_name, subcategory_name)
-CATEGORY_KEYWORDS: Dict[str, Tuple[str, str]] = {
+# Read-only: the keyword automaton and categorizers index rules by position in this table
+CATEGORY_KEYWORDS: Mapping[str, Tuple[str, str]] = MappingProxyType({
     # Income patterns
     "payroll": ("Income", "Salary"),
     "direct dep": ("Income", "Salary"),
@@ -397,7 +425,29 @@ CATEGORY_KEYWORDS: Dict[str, Tuple[str, str]] = {
     "attorney": ("Miscellaneous", "Legal Fees"),
     "lawyer": ("Miscellaneous", "Legal Fees"),
     "legal": ("Miscellaneous", "Legal Fees"),
-}
+})
+
+
+def _build_keyword_automaton():
+    """
+    Build an Aho-Corasick automaton over the built-in keywords so a description
+    can be matched against all of them in a single pass.
+    Each keyword maps to its position in CATEGORY_KEYWORDS.
+    """
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for index, keyword in enumerate(CATEGORY_KEYWORDS):
+        automaton.add_word(keyword, index)
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+# Built-in keywords by CATEGORY_KEYWORDS position
+_BUILTIN_KEYWORD_LIST = tuple(CATEGORY_KEYWORDS)
+_BUILTIN_KEYWORDS_CRC = zlib.crc32(repr(list(CATEGORY_KEYWORDS.items())).encode())
 
 
 class ImportedTransaction(BaseModel):
@@ -435,36 +485,330 @@ class ImportResult(BaseModel):
     auto_categorized_count: int
 
 
-def find_category_by_user_keywords(text: str, transaction_type: TransactionType, db: Session) -> Optional[Tuple[int, str]]:
+class ImportJob(BaseModel):
+    """Schema for a background import job"""
+    job_id: str
+    status: str  # pending, running, completed, failed
+    result: Optional[ImportResult] = None
+    error: Optional[str] = None
+
+
+# Background import jobs by id; the oldest finished ones are dropped past this many
+MAX_IMPORT_JOBS = 100
+_import_jobs: Dict[str, ImportJob] = {}
+# The upload handler, the background task and the status endpoint run on different threadpool threads
+_import_jobs_lock = threading.Lock()
+
+
+def _register_import_job(job_id: str) -> ImportJob:
+    """Add a pending job, evicting the oldest completed/failed jobs past MAX_IMPORT_JOBS"""
+    job = ImportJob(job_id=job_id, status="pending")
+    with _import_jobs_lock:
+        _import_jobs[job_id] = job
+        excess = len(_import_jobs) - MAX_IMPORT_JOBS
+        if excess > 0:
+            # Pending and running jobs are never dropped, so a queued import always runs
+            finished = [
+                old_id for old_id, old_job in _import_jobs.items()
+                if old_job.status in ("completed", "failed")
+            ]
+            for old_id in finished[:excess]:
+                del _import_jobs[old_id]
+    return job
+
+
+def _get_import_job(job_id: str) -> Optional[ImportJob]:
+    """Look up a background import job by id"""
+    with _import_jobs_lock:
+        return _import_jobs.get(job_id)
+
+
+# Compiled categorizers are cached per database and rebuilt after this many seconds
+CATEGORIZER_TTL_SECONDS = 300
+
+# Distinct (text, transaction type) match results remembered per categorizer
+CATEGORIZER_MATCH_CACHE_SIZE = 4096
+
+# Maps database URL -> (built_at, Categorizer)
+_categorizer_cache: Dict[str, Tuple[float, "Categorizer"]] = {}
+
+
+# Match-mode tests for user keyword rules, called as test(text_lower, keyword)
+_MATCH_MODE_TESTS: Dict[str, Callable[[str, str], bool]] = {
+    'exact': operator.eq,
+    'starts_with': str.startswith,
+    'contains': operator.contains,
+}
+
+
+def _expected_category_type(transaction_type: TransactionType) -> CategoryType:
+    """Category type a transaction of the given type may be assigned to"""
+    return CategoryType.INCOME if transaction_type == TransactionType.INCOME else CategoryType.EXPENSE
+
+
+class _RuleMatcher:
     """
-    Find a matching category based on user-defined keyword rules.
-    Returns (category_id, category_name) or None if no match.
-    User-defined keywords take priority over built-in ones.
+    Finds the highest-priority rule matching a lowercased text.
+    'contains' rules go into one automaton, 'exact' rules into a dict and
+    'starts_with' rules into a dict probed once per distinct prefix length, all
+    valued by rule position; any remaining rules are checked one by one, by position.
     """
-    if not text:
-        return None
-    
-    # Get active user keywords ordered by priority (highest first)
-    user_keywords = db.query(CategoryKeyword).filter(
+
+    def __init__(self, rules: list):
+        # [(test, keyword_lower, category_id, full_name)], highest priority first
+        self.rules = rules
+        self._automaton = None
+        self._exact = {}
+        self._prefix = {}
+        self._prefix_lengths = ()
+        self._scan = []
+        
+        automaton = ahocorasick.Automaton() if ahocorasick is not None else None
+        for position, (test, keyword, _, _) in enumerate(rules):
+            if test is operator.eq:
+                self._exact.setdefault(keyword, position)
+            elif test is str.startswith:
+                self._prefix.setdefault(keyword, position)
+            elif automaton is not None and test is operator.contains and keyword:
+                # Keep the highest-priority rule for repeated keywords
+                if keyword not in automaton:
+                    automaton.add_word(keyword, position)
+            else:
+                self._scan.append(position)
+        if automaton is not None and len(automaton):
+            automaton.make_automaton()
+            self._automaton = automaton
+        self._prefix_lengths = tuple(sorted({len(keyword) for keyword in self._prefix}))
+
+    def first(self, text_lower: str) -> Optional[tuple]:
+        """The first matching rule in priority order, or None"""
+        best = self._exact.get(text_lower)
+        for length in self._prefix_lengths:
+            if length > len(text_lower):
+                break
+            position = self._prefix.get(text_lower[:length])
+            if position is not None and (best is None or position < best):
+                best = position
+        if self._automaton is not None:
+            for _, position in self._automaton.iter(text_lower):
+                if best is None or position < best:
+                    best = position
+        
+        for position in self._scan:
+            if best is not None and position > best:
+                break
+            test, keyword, _, _ = self.rules[position]
+            if test(text_lower, keyword):
+                best = position
+                break
+        
+        return self.rules[best] if best is not None else None
+
+
+class Categorizer:
+    """
+    Keyword rules resolved against the categories in the database.
+    Built once and shared across requests so imports don't re-query
+    the rules and categories for every transaction.
+    """
+
+    def __init__(
+        self,
+        user_rules: List[Tuple[CategoryType, tuple]],
+        builtin_rules: List[Optional[Tuple[int, str, CategoryType]]],
+        version: int = 0
+    ):
+        # [(category_type, (test, keyword_lower, category_id, full_name))], highest priority first
+        self.user_rules = user_rules
+        # (category_id, full_name, category_type) per CATEGORY_KEYWORDS position,
+        # None where the category doesn't exist
+        self.builtin_rules = builtin_rules
+        # Fingerprint of the rule set; equal versions always categorize text the same way
+        self.version = version
+        
+        # Statements repeat the same merchants; results are cached for this rule set only,
+        # so rebuilding the categorizer after a rule change starts a fresh cache
+        self.match = functools.lru_cache(maxsize=CATEGORIZER_MATCH_CACHE_SIZE)(self._match)
+        
+        # Imports only consider rules of the transaction's category type, so group
+        # them by type; keyword testing looks at every rule regardless of type
+        by_type = {}
+        for category_type, rule in user_rules:
+            by_type.setdefault(category_type, []).append(rule)
+        self._user_matchers = {category_type: _RuleMatcher(rules) for category_type, rules in by_type.items()}
+        self._any_type_matcher = _RuleMatcher([rule for _, rule in user_rules])
+
+    def _match_user(self, text_lower: str, expected_type: CategoryType) -> Optional[Tuple[int, str]]:
+        """Highest-priority user rule matching already-lowercased text"""
+        matcher = self._user_matchers.get(expected_type)
+        rule = matcher.first(text_lower) if matcher else None
+        if rule is None:
+            return None
+        _, _, category_id, full_name = rule
+        return (category_id, full_name)
+
+    def first_user_rule(self, text: str) -> Optional[Tuple[str, int, str]]:
+        """
+        Highest-priority user rule matching text, of any category type.
+        Returns (keyword, category_id, full_name).
+        """
+        if not text:
+            return None
+        
+        rule = self._any_type_matcher.first(text.lower())
+        if rule is None:
+            return None
+        _, keyword, category_id, full_name = rule
+        return (keyword, category_id, full_name)
+
+    def _first_builtin(self, text_lower: str, expected_type: Optional[CategoryType] = None) -> Optional[int]:
+        """
+        CATEGORY_KEYWORDS position of the first built-in keyword in already-lowercased
+        text whose category exists (and is of expected_type, if given).
+        """
+        if _KEYWORD_AUTOMATON is None:
+            for index, (keyword, rule) in enumerate(zip(CATEGORY_KEYWORDS, self.builtin_rules)):
+                if rule and (expected_type is None or rule[2] == expected_type) and keyword in text_lower:
+                    return index
+            return None
+        
+        # The automaton reports hits by position in the text; keep the one that
+        # comes first in CATEGORY_KEYWORDS to match the linear scan's result
+        best_index = None
+        for _, index in _KEYWORD_AUTOMATON.iter(text_lower):
+            if best_index is not None and index >= best_index:
+                continue
+            rule = self.builtin_rules[index]
+            if rule and (expected_type is None or rule[2] == expected_type):
+                best_index = index
+        return best_index
+
+    def _match_builtin(self, text_lower: str, expected_type: CategoryType) -> Optional[Tuple[int, str]]:
+        """First built-in keyword (in CATEGORY_KEYWORDS order) matching already-lowercased text"""
+        index = self._first_builtin(text_lower, expected_type)
+        if index is None:
+            return None
+        category_id, full_name, _ = self.builtin_rules[index]
+        return (category_id, full_name)
+
+    def first_builtin_rule(self, text: str) -> Optional[Tuple[str, int, str]]:
+        """
+        First built-in keyword matching text, of any category type.
+        Returns (keyword, category_id, full_name).
+        """
+        if not text:
+            return None
+        
+        index = self._first_builtin(text.lower())
+        if index is None:
+            return None
+        category_id, full_name, _ = self.builtin_rules[index]
+        return (_BUILTIN_KEYWORD_LIST[index], category_id, full_name)
+
+    def match_user(self, text: str, transaction_type: TransactionType) -> Optional[Tuple[int, str]]:
+        """Match text against user-defined keyword rules"""
+        if not text:
+            return None
+        
+        return self._match_user(text.lower(), _expected_category_type(transaction_type))
+
+    def _match(self, text: str, transaction_type: TransactionType) -> Optional[Tuple[int, str]]:
+        """Match text against user-defined keywords first, then built-in keywords"""
+        if not text:
+            return None
+        
+        text_lower = text.lower()
+        expected_type = _expected_category_type(transaction_type)
+        
+        return self._match_user(text_lower, expected_type) or self._match_builtin(text_lower, expected_type)
+
+
+def _resolve_categories(db: Session) -> Dict[Tuple[str, str], Tuple[int, str, CategoryType]]:
+    """
+    Map (parent_name, subcategory_name) to (category_id, full_name, category_type)
+    for every subcategory, using a single query.
+    """
+    parent = aliased(Category)
+    rows = db.query(Category, parent).join(
+        parent, Category.parent_id == parent.id
+    ).filter(
+        parent.parent_id == None
+    ).order_by(parent.id, Category.id).all()
+    
+    resolved = {}
+    for subcategory, parent_category in rows:
+        # Keep the first match, as the old per-keyword lookups did
+        resolved.setdefault(
+            (parent_category.name, subcategory.name),
+            (subcategory.id, f"{parent_category.name} > {subcategory.name}", subcategory.category_type)
+        )
+    return resolved
+
+
+def build_categorizer(db: Session) -> Categorizer:
+    """Load active keyword rules and resolve their categories"""
+    user_rules = []
+    signature = []
+    
+    # Get active user keywords ordered by priority (highest first), with their categories
+    user_keywords = db.query(CategoryKeyword).options(
+        joinedload(CategoryKeyword.category).joinedload(Category.parent)
+    ).filter(
         CategoryKeyword.is_active == True
     ).order_by(CategoryKeyword.priority.desc()).all()
     
     for kw in user_keywords:
-        if kw.matches(text):
-            # Verify the category exists and matches transaction type
-            category = db.query(Category).filter(Category.id == kw.category_id).first()
-            if category:
-                expected_type = CategoryType.INCOME if transaction_type == TransactionType.INCOME else CategoryType.EXPENSE
-                if category.category_type == expected_type:
-                    # Get full category name
-                    if category.parent_id:
-                        parent = db.query(Category).filter(Category.id == category.parent_id).first()
-                        full_name = f"{parent.name} > {category.name}" if parent else category.name
-                    else:
-                        full_name = category.name
-                    return (category.id, full_name)
+        # Skip rules whose category no longer exists
+        category = kw.category
+        if not category:
+            continue
+        
+        # Get full category name
+        if category.parent:
+            full_name = f"{category.parent.name} > {category.name}"
+        else:
+            full_name = category.name
+        
+        test = _MATCH_MODE_TESTS.get(kw.match_mode, operator.contains)  # 'contains' is default
+        user_rules.append((category.category_type, (test, kw.keyword.lower(), category.id, full_name)))
+        signature.append((category.category_type.value, kw.match_mode, kw.keyword.lower(), category.id, full_name))
     
-    return None
+    resolved = _resolve_categories(db)
+    builtin_rules = [resolved.get(category_names) for category_names in CATEGORY_KEYWORDS.values()]
+    
+    # Covers the rules, their resolved categories and the built-in keyword table
+    signature.append([rule and (rule[0], rule[1], rule[2].value) for rule in builtin_rules])
+    version = zlib.crc32(repr(signature).encode(), _BUILTIN_KEYWORDS_CRC)
+    
+    return Categorizer(user_rules, builtin_rules, version)
+
+
+def load_categorizer(db: Session) -> Categorizer:
+    """Get the cached categorizer for this database, rebuilding it once expired"""
+    key = str(db.get_bind().url)
+    now = time.monotonic()
+    
+    cached = _categorizer_cache.get(key)
+    if cached and now - cached[0] < CATEGORIZER_TTL_SECONDS:
+        return cached[1]
+    
+    categorizer = build_categorizer(db)
+    _categorizer_cache[key] = (now, categorizer)
+    return categorizer
+
+
+def invalidate_categorizer_cache() -> None:
+    """Drop cached categorizers; call after keyword rules or categories change"""
+    _categorizer_cache.clear()
+
+
+def find_category_by_user_keywords(text: str, transaction_type: TransactionType, db: Session) -> Optional[Tuple[int, str]]:
+    """
+    Find a matching category based on user-defined keyword rules.
+    Returns (category_id, category_name) or None if no match.
+    User-defined keywords take priority over built-in ones.
+    """
+    return load_categorizer(db).match_user(text, transaction_type)
 
 
 def find_category_by_keywords(text: str, transaction_type: TransactionType, db: Session) -> Optional[Tuple[int, str]]:
@@ -473,57 +817,67 @@ def find_category_by_keywords(text: str, transaction_type: TransactionType, db:
     First checks user-defined keywords, then falls back to built-in keywords.
     Returns (category_id, category_name) or None if no match.
     """
-    if not text:
-        return None
-    
-    # First try user-defined keywords (higher priority)
-    result = find_category_by_user_keywords(text, transaction_type, db)
-    if result:
-        return result
-    
-    # Fall back to built-in keywords
-    text_lower = text.lower()
-    
-    # Try to find a matching keyword
-    for keyword, (parent_name, subcategory_name) in CATEGORY_KEYWORDS.items():
-        if keyword in text_lower:
-            # Look up the category in the database
-            # First find the parent
-            parent = db.query(Category).filter(
-                Category.name == parent_name,
-                Category.parent_id == None
-            ).first()
-            
-            if parent:
-                # Find the subcategory
-                subcategory = db.query(Category).filter(
-                    Category.name == subcategory_name,
-                    Category.parent_id == parent.id
-                ).first()
-                
-                if subcategory:
-                    # Verify the category type matches the transaction type
-                    expected_type = CategoryType.INCOME if transaction_type == TransactionType.INCOME else CategoryType.EXPENSE
-                    if subcategory.category_type == expected_type:
-                        return (subcategory.id, f"{parent_name} > {subcategory_name}")
-    
-    return None
+    return load_categorizer(db).match(text, transaction_type)
 
 
-def auto_categorize_transaction(trans: ImportedTransaction, db: Session) -> ImportedTransaction:
+def _categorization_text(
+    payee: Optional[str],
+    description: Optional[str],
+    original_description: Optional[str] = None
+) -> str:
     """
-    Attempt to auto-categorize a transaction based on its description/payee.
+    Text matched against keyword rules, shared by import and recategorization.
+    original_description is the untrimmed form of description, so it replaces it
+    rather than being appended; stored rows then give the same text as at import.
+    Fields are joined with a separator no keyword contains, so matches can't span two fields.
     """
-    # Combine payee and description for matching
-    search_text = " ".join(filter(None, [trans.payee, trans.description, trans.original_description]))
-    
-    result = find_category_by_keywords(search_text, trans.transaction_type, db)
+    return "\x01".join([field for field in (payee, original_description or description) if field])
+
+
+def auto_categorize_batch(transactions: List[ImportedTransaction], categorizer: Categorizer) -> int:
+    """
+    Auto-categorize a list of transactions in place with one categorizer.
+    Returns the number of transactions that were given a category.
+    """
+    match = categorizer.match
+    categorized_count = 0
     
-    if result:
-        trans.suggested_category_id = result[0]
-        trans.suggested_category_name = result[1]
+    for trans in transactions:
+        search_text = _categorization_text(trans.payee, trans.description, trans.original_description)
+        result = match(search_text, trans.transaction_type)
+        if result:
+            trans.suggested_category_id = result[0]
+            trans.suggested_category_name = result[1]
+            categorized_count += 1
     
-    return trans
+    return categorized_count
+
+
+# Common column name mappings per role (in priority order)
+CSV_COLUMN_PATTERNS: Dict[str, List[str]] = {
+    'date': ['date', 'transaction date', 'posted date', 'trans date', 'posting date', 
+             'trans. date', 'post date', 'transdate', 'postdate', 'trans.date', 'trans'],
+    'description': ['description', 'memo', 'narrative', 'details', 'transaction description', 
+                    'name', 'desc', 'merchant', 'payee', 'merchant name'],
+    'amount': ['amount', 'transaction amount', 'value', 'sum', 'total'],
+    'debit': ['debit', 'withdrawal', 'withdrawals', 'debit amount', 'debit amt', 'expense'],
+    'credit': ['credit', 'deposit', 'deposits', 'credit amount', 'credit amt', 'income'],
+}
+
+
+def _build_column_roles() -> Dict[str, List[Tuple[str, int]]]:
+    """Map each exact column name to the (role, priority) pairs it satisfies"""
+    roles = {}
+    for role, patterns in CSV_COLUMN_PATTERNS.items():
+        for priority, pattern in enumerate(patterns):
+            roles.setdefault(pattern, []).append((role, priority))
+    return roles
+
+
+_COLUMN_ROLES = _build_column_roles()
+
+# Characters ignored when comparing column names
+_HEADER_STRIP = str.maketrans('', '', '. _')
 
 
 def find_matching_column(normalized_headers: dict, patterns: list) -> Optional[str]:
@@ -537,91 +891,209 @@ def find_matching_column(normalized_headers: dict, patterns: list) -> Optional[s
         if pattern in normalized_headers:
             return normalized_headers[pattern]
     
+    # Remove periods, spaces, and underscores once up front for the abbreviation checks
+    cleaned_headers = [
+        (header_lower, header_lower.translate(_HEADER_STRIP), header_orig)
+        for header_lower, header_orig in normalized_headers.items()
+    ]
+    
     # Then try partial match (column contains pattern or pattern contains column)
     for pattern in patterns:
-        for header_lower, header_orig in normalized_headers.items():
+        clean_pattern = pattern.translate(_HEADER_STRIP)
+        for header_lower, clean_header, header_orig in cleaned_headers:
             # Check if pattern is contained in header or vice versa
             if pattern in header_lower or header_lower in pattern:
                 return header_orig
             # Check for common abbreviations/variations
-            # Remove periods, spaces, and common suffixes for matching
-            clean_pattern = pattern.replace('.', '').replace(' ', '').replace('_', '')
-            clean_header = header_lower.replace('.', '').replace(' ', '').replace('_', '')
             if clean_pattern in clean_header or clean_header in clean_pattern:
                 return header_orig
     
     return None
 
 
-def parse_csv_file(content: str, date_format: str = "%m/%d/%Y") -> List[ImportedTransaction]:
+# Numeric date layouts that can skip strptime: format -> (separator, year, month, day positions)
+_DATE_LAYOUTS: Dict[str, Tuple[str, int, int, int]] = {
+    "%m/%d/%Y": ("/", 2, 0, 1),
+    "%d/%m/%Y": ("/", 2, 1, 0),
+    "%Y/%m/%d": ("/", 0, 1, 2),
+    "%m-%d-%Y": ("-", 2, 0, 1),
+    "%d-%m-%Y": ("-", 2, 1, 0),
+    "%Y-%m-%d": ("-", 0, 1, 2),
+}
+
+# Currency symbols and separators dropped from amount cells
+_AMOUNT_STRIP = str.maketrans('', '', '$, ')
+
+# Debit/credit cell values that mean "no amount in this column"
+_EMPTY_AMOUNTS = frozenset(['', '-', '0', '0.00'])
+
+# Accounting-style negative amounts, e.g. (12.50)
+_PAREN_RE = re.compile(r'^\((.*)\)$')
+
+_DATE_RE = re.compile(r'^(\d{1,4})([-/])(\d{1,2})([-/])(\d{1,4})$')
+
+
+@functools.lru_cache(maxsize=32)
+def _date_parser(fmt: str) -> Callable[[str], Optional[date]]:
+    """
+    Build a parser for a single date format, resolved once per format.
+    Common numeric layouts are parsed with a regex instead of strptime.
     """
-    Parse CSV file content into transactions.
+    layout = _DATE_LAYOUTS.get(fmt)
+    if layout is None:
+        strptime = datetime.strptime
+        
+        def parse(date_str: str) -> Optional[date]:
+            try:
+                return strptime(date_str, fmt).date()
+            except ValueError:
+                return None
+        
+        return parse
+    
+    separator, year_pos, month_pos, day_pos = layout
+    match_date = _DATE_RE.match
+    
+    def parse(date_str: str) -> Optional[date]:
+        match = match_date(date_str)
+        if not match:
+            return None
+        if match.group(2) != separator or match.group(4) != separator:
+            return None
+        
+        parts = (match.group(1), match.group(3), match.group(5))
+        # Same widths strptime accepts: 4-digit year, 1-2 digit month and day
+        if len(parts[year_pos]) != 4 or len(parts[month_pos]) > 2 or len(parts[day_pos]) > 2:
+            return None
+        
+        try:
+            return date(int(parts[year_pos]), int(parts[month_pos]), int(parts[day_pos]))
+        except ValueError:
+            return None
+    
+    return parse
+
+
+def parse_date_with_format(date_str: str, fmt: str) -> Optional[date]:
+    """Parse a date string with a single format, returning None if it doesn't match"""
+    return _date_parser(fmt)(date_str)
+
+
+def detect_csv_columns(normalized_headers: dict) -> Dict[str, Optional[str]]:
+    """
+    Map each column role (date, description, amount, debit, credit) to a CSV header.
+    Exact names are classified in a single pass over the headers; only roles
+    without an exact match fall back to partial matching.
+    """
+    # role -> (priority, original header) of the best exact match so far
+    exact: Dict[str, Tuple[int, str]] = {}
+    for header_lower, header_orig in normalized_headers.items():
+        for role, priority in _COLUMN_ROLES.get(header_lower, ()):
+            if role not in exact or priority < exact[role][0]:
+                exact[role] = (priority, header_orig)
+    
+    columns = {}
+    for role, patterns in CSV_COLUMN_PATTERNS.items():
+        if role in exact:
+            columns[role] = exact[role][1]
+        else:
+            columns[role] = find_matching_column(normalized_headers, patterns)
+    return columns
+
+
+def parse_csv_file(stream: TextIO, date_format: str = "%m/%d/%Y") -> List[ImportedTransaction]:
+    """
+    Parse CSV rows from a text stream into transactions.
     Supports common bank CSV formats with auto-detection.
     """
     transactions = []
-    reader = csv.DictReader(io.StringIO(content))
+    reader = csv.reader(stream)
+    fieldnames = next(reader, None)
     
     # Normalize header names (lowercase, strip whitespace)
-    if reader.fieldnames:
-        normalized_headers = {h.lower().strip(): h for h in reader.fieldnames}
+    if fieldnames:
+        normalized_headers = {h.lower().strip(): h for h in fieldnames}
     else:
         raise ValueError("CSV file has no headers")
     
-    # Common column name mappings (in priority order)
-    date_columns = ['date', 'transaction date', 'posted date', 'trans date', 'posting date', 
-                    'trans. date', 'post date', 'transdate', 'postdate', 'trans.date', 'trans']
-    description_columns = ['description', 'memo', 'narrative', 'details', 'transaction description', 
-                          'name', 'desc', 'merchant', 'payee', 'merchant name']
-    amount_columns = ['amount', 'transaction amount', 'value', 'sum', 'total']
-    debit_columns = ['debit', 'withdrawal', 'withdrawals', 'debit amount', 'debit amt', 'expense']
-    credit_columns = ['credit', 'deposit', 'deposits', 'credit amount', 'credit amt', 'income']
+    # Column positions by header name (last duplicate wins, as with DictReader)
+    column_index = {h: i for i, h in enumerate(fieldnames)}
     
     # Find matching columns using flexible matching
-    date_col = find_matching_column(normalized_headers, date_columns)
-    desc_col = find_matching_column(normalized_headers, description_columns)
-    amount_col = find_matching_column(normalized_headers, amount_columns)
-    debit_col = find_matching_column(normalized_headers, debit_columns)
-    credit_col = find_matching_column(normalized_headers, credit_columns)
+    columns = detect_csv_columns(normalized_headers)
+    date_col = columns['date']
+    desc_col = columns['description']
+    amount_col = columns['amount']
+    debit_col = columns['debit']
+    credit_col = columns['credit']
     
     # Log detected columns for debugging
-    print(f"CSV Headers: {list(normalized_headers.keys())}")
-    print(f"Detected columns - date: {date_col}, desc: {desc_col}, amount: {amount_col}, debit: {debit_col}, credit: {credit_col}")
+    logger.debug("CSV Headers: %s", list(normalized_headers.keys()))
+    logger.debug(
+        "Detected columns - date: %s, desc: %s, amount: %s, debit: %s, credit: %s",
+        date_col, desc_col, amount_col, debit_col, credit_col
+    )
     
     if not date_col:
         raise ValueError("Could not find date column in CSV")
     
+    # Resolve columns to positions once instead of building a dict per row
+    date_idx = column_index[date_col]
+    desc_idx = column_index[desc_col] if desc_col else None
+    amount_idx = column_index[amount_col] if amount_col else None
+    debit_idx = column_index[debit_col] if debit_col else None
+    credit_idx = column_index[credit_col] if credit_col else None
+    width = len(fieldnames)
+    
+    # Resolve each candidate format to its parser once; duplicates of the
+    # requested format are dropped so failing rows aren't retried twice
+    date_formats = [date_format, "%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y", "%m-%d-%Y", "%Y/%m/%d"]
+    date_parsers = [_date_parser(fmt) for fmt in dict.fromkeys(date_formats)]
+    primary_parser, fallback_parsers = date_parsers[0], date_parsers[1:]
+    # The requested format always goes first, so ambiguous dates keep its reading;
+    # the first fallback that handles a row is tried first among the fallbacks after that
+    sticky_parser = None
+    
     # Parse rows
     for row in reader:
         try:
+            # Pad short rows so every detected column can be indexed
+            if len(row) < width:
+                row.extend([''] * (width - len(row)))
+            
             # Parse date with multiple format attempts
-            date_str = row.get(date_col, '').strip()
-            trans_date = None
+            date_str = row[date_idx].strip()
+            trans_date = primary_parser(date_str)
             
-            for fmt in [date_format, "%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y", "%m-%d-%Y", "%Y/%m/%d"]:
-                try:
-                    trans_date = datetime.strptime(date_str, fmt).date()
-                    break
-                except ValueError:
-                    continue
+            if not trans_date and sticky_parser:
+                trans_date = sticky_parser(date_str)
+            
+            if not trans_date:
+                for parse_date in fallback_parsers:
+                    trans_date = parse_date(date_str)
+                    if trans_date:
+                        if sticky_parser is None:
+                            sticky_parser = parse_date
+                        break
             
             if not trans_date:
                 continue  # Skip rows with unparseable dates
             
             # Get description
-            description = row.get(desc_col, '').strip() if desc_col else ''
+            description = row[desc_idx].strip() if desc_idx is not None else ''
             
             # Parse amount
             amount = 0.0
             trans_type = TransactionType.EXPENSE
             
-            if amount_col and row.get(amount_col):
+            if amount_idx is not None and row[amount_idx]:
                 # Single amount column (negative = expense, positive = income)
-                amount_str = row.get(amount_col, '0').strip()
-                amount_str = amount_str.replace('$', '').replace(',', '').replace(' ', '')
+                amount_str = row[amount_idx].strip().translate(_AMOUNT_STRIP)
                 
                 # Handle parentheses for negative numbers
-                if '(' in amount_str and ')' in amount_str:
-                    amount_str = '-' + amount_str.replace('(', '').replace(')', '')
+                paren_match = _PAREN_RE.match(amount_str)
+                if paren_match:
+                    amount_str = '-' + paren_match.group(1)
                 
                 try:
                     amount = float(amount_str)
@@ -633,23 +1105,20 @@ def parse_csv_file(content: str, date_format: str = "%m/%d/%Y") -> List[Imported
                 except ValueError:
                     continue
             
-            elif debit_col or credit_col:
-                # Separate debit/credit columns
-                debit_str = row.get(debit_col, '').strip() if debit_col else ''
-                credit_str = row.get(credit_col, '').strip() if credit_col else ''
-                
-                debit_str = debit_str.replace('$', '').replace(',', '').replace(' ', '')
-                credit_str = credit_str.replace('$', '').replace(',', '').replace(' ', '')
+            elif debit_idx is not None or credit_idx is not None:
+                # Separate debit/credit columns; the credit cell is only cleaned when there's no debit
+                debit_str = row[debit_idx].strip().translate(_AMOUNT_STRIP) if debit_idx is not None else ''
                 
                 try:
-                    if debit_str and debit_str not in ['', '-', '0', '0.00']:
+                    if debit_str not in _EMPTY_AMOUNTS:
                         amount = abs(float(debit_str))
                         trans_type = TransactionType.EXPENSE
-                    elif credit_str and credit_str not in ['', '-', '0', '0.00']:
+                    else:
+                        credit_str = row[credit_idx].strip().translate(_AMOUNT_STRIP) if credit_idx is not None else ''
+                        if credit_str in _EMPTY_AMOUNTS:
+                            continue
                         amount = abs(float(credit_str))
                         trans_type = TransactionType.INCOME
-                    else:
-                        continue
                 except ValueError:
                     continue
             else:
@@ -658,7 +1127,8 @@ def parse_csv_file(content: str, date_format: str = "%m/%d/%Y") -> List[Imported
             if amount == 0:
                 continue
             
-            transactions.append(ImportedTransaction(
+            # Fields are already typed and trimmed, so skip per-row validation
+            transactions.append(ImportedTransaction.model_construct(
                 transaction_date=trans_date,
                 payee=description[:100] if description else None,
                 description=description,
@@ -718,8 +1188,108 @@ def preprocess_ofx_content(content: bytes) -> bytes:
     return text.encode('utf-8')
 
 
+# DTPOSTED values: YYYYMMDD[HHMMSS[.XXX]][[offset:TZ]]
+_OFX_DATE_RE = re.compile(
+    r'^(\d{4})(\d{2})(\d{2})(?:(\d{2})(\d{2})(\d{2})?)?(?:\.\d+)?'
+    r'(?:\[([-+]?\d+(?:\.\d+)?)(?::[^\]]*)?\])?'
+)
+
+
+def _ofx_local_name(tag: str) -> str:
+    """Strip any XML namespace from a tag name"""
+    return tag.rpartition('}')[2]
+
+
+def _parse_ofx_date(value: str) -> date:
+    """Parse an OFX date, converted to UTC the same way ofxparse does"""
+    match = _OFX_DATE_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid OFX date: {value}")
+    
+    year, month, day, hour, minute, second, offset = match.groups()
+    parsed = datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0), int(second or 0))
+    if offset:
+        parsed -= timedelta(hours=float(offset))
+    return parsed.date()
+
+
+def _parse_ofx_xml(fp: BinaryIO) -> Optional[List[ImportedTransaction]]:
+    """
+    Fast path for OFX 2.x (XML) files: stream the STMTTRN elements with iterparse
+    straight from the file instead of building the full ofxparse object tree.
+    Returns None if the file isn't XML or has content this path doesn't handle,
+    so the caller can fall back to ofxparse.
+    """
+    start = fp.tell()
+    head = fp.read(64)
+    fp.seek(start)
+    if not head.lstrip().startswith(b'<?xml'):
+        return None  # OFX 1.x SGML
+    
+    transactions = []
+    
+    try:
+        for _, elem in ET.iterparse(fp, events=('end',)):
+            tag = _ofx_local_name(elem.tag)
+            
+            # Investment statements have their own transaction types; leave them to ofxparse
+            if tag == 'INVSTMTRS':
+                return None
+            if tag != 'STMTTRN':
+                continue
+            
+            fields = {_ofx_local_name(child.tag): (child.text or '').strip() for child in elem}
+            if not fields.get('NAME'):
+                payee_elem = next((child for child in elem if _ofx_local_name(child.tag) == 'PAYEE'), None)
+                if payee_elem is not None:
+                    fields['NAME'] = next(
+                        ((c.text or '').strip() for c in payee_elem if _ofx_local_name(c.tag) == 'NAME'), ''
+                    )
+            
+            amount_str = fields.get('TRNAMT', '')
+            if ',' in amount_str and '.' not in amount_str:
+                amount_str = amount_str.replace(',', '.')
+            amount = float(amount_str)
+            if amount >= 0:
+                trans_type = TransactionType.INCOME
+            else:
+                trans_type = TransactionType.EXPENSE
+                amount = abs(amount)
+            
+            payee = fields.get('NAME') or None
+            memo = fields.get('MEMO') or None
+            description = payee or memo or ''
+            
+            transactions.append(ImportedTransaction.model_construct(
+                transaction_date=_parse_ofx_date(fields.get('DTPOSTED', '')),
+                payee=payee[:100] if payee else (memo[:100] if memo else None),
+                description=description[:500] if description else None,
+                amount=amount,
+                transaction_type=trans_type,
+                original_description=description,
+                fit_id=fields.get('FITID') or None
+            ))
+            
+            # Drop the parsed subtree so memory stays flat on large downloads
+            elem.clear()
+    
+    except (ET.ParseError, ValueError):
+        return None
+    
+    return transactions
+
+
 def parse_ofx_file(content: bytes) -> List[ImportedTransaction]:
     """Parse OFX/QFX file content into transactions."""
+    transactions = _parse_ofx_xml(io.BytesIO(content))
+    if transactions is not None:
+        return transactions
+    
+    return _parse_ofx_with_ofxparse(content)
+
+
+def _parse_ofx_with_ofxparse(content: bytes) -> List[ImportedTransaction]:
+    """Parse OFX/QFX content (including OFX 1.x SGML) with ofxparse"""
     try:
         from ofxparse import OfxParser
     except ImportError:
@@ -751,7 +1321,7 @@ def parse_ofx_file(content: bytes) -> List[ImportedTransaction]:
                 # Parse date
                 trans_date = trans.date.date() if hasattr(trans.date, 'date') else trans.date
                 
-                transactions.append(ImportedTransaction(
+                transactions.append(ImportedTransaction.model_construct(
                     transaction_date=trans_date,
                     payee=payee[:100] if payee else (memo[:100] if memo else None),
                     description=description[:500] if description else None,
@@ -786,17 +1356,7 @@ def flip_transaction_types(transactions: List[ImportedTransaction]) -> List[Impo
             else TransactionType.INCOME
         )
         
-        adjusted.append(ImportedTransaction(
-            transaction_date=trans.transaction_date,
-            payee=trans.payee,
-            description=trans.description,
-            amount=trans.amount,
-            transaction_type=new_type,
-            original_description=trans.original_description,
-            fit_id=trans.fit_id,
-            suggested_category_id=trans.suggested_category_id,
-            suggested_category_name=trans.suggested_category_name
-        ))
+        adjusted.append(trans.model_copy(update={"transaction_type": new_type}))
     
     return adjusted
 
@@ -806,30 +1366,231 @@ def should_auto_flip_for_account(account: Account) -> bool:
     Determine if transaction types should be auto-flipped based on account type.
     Returns True for credit card accounts by default.
     """
-    from app.models.account import AccountType
     return account.account_type == AccountType.CREDIT_CARD
 
 
-def check_duplicates(transactions: List[ImportedTransaction], account_id: int, db: Session) -> List[bool]:
-    """Check which transactions might be duplicates."""
+def check_duplicates(transactions: List[ImportedTransaction], account_id: int, db: Session) -> Tuple[List[bool], int]:
+    """
+    Check which transactions might be duplicates.
+    Returns (per-transaction flags, number of duplicates).
+    """
+    if not transactions:
+        return [], 0
+    
+    # Load every existing transaction in the file's date range once
+    min_date = min(t.transaction_date for t in transactions)
+    max_date = max(t.transaction_date for t in transactions)
+    
+    rows = db.query(
+        Transaction.transaction_date,
+        Transaction.amount,
+        Transaction.transaction_type
+    ).filter(
+        Transaction.account_id == account_id,
+        Transaction.transaction_date.between(min_date, max_date)
+    ).all()
+    existing = {tuple(row) for row in rows}
+    
+    # Exact match on date, amount, and type
     duplicates = []
+    duplicates_count = 0
+    for trans in transactions:
+        is_duplicate = (trans.transaction_date, trans.amount, trans.transaction_type) in existing
+        duplicates.append(is_duplicate)
+        if is_duplicate:
+            duplicates_count += 1
+    
+    return duplicates, duplicates_count
+
+
+# Bytes read from the start of a CSV upload to detect its encoding
+CSV_SNIFF_BYTES = 64 * 1024
+
+
+def _detect_csv_encoding(fp: BinaryIO) -> str:
+    """Guess a CSV upload's encoding from its BOM and first block, without consuming it"""
+    start = fp.tell()
+    head = fp.read(CSV_SNIFF_BYTES)
+    fp.seek(start)
+    
+    if head.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    
+    try:
+        # Incremental so a multi-byte character cut off at the block end isn't an error
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _do_csv(fp: BinaryIO, date_format: str) -> List[ImportedTransaction]:
+    """
+    Parse an uploaded CSV file straight from its file object.
+    The encoding is sniffed up front; if a UTF-8 file turns out to have
+    invalid bytes further in, it is re-read as Latin-1.
+    """
+    encoding = _detect_csv_encoding(fp)
+    encodings = (encoding,) if encoding == 'latin-1' else (encoding, 'latin-1')
+    
+    for encoding in encodings:
+        fp.seek(0)
+        text_stream = io.TextIOWrapper(fp, encoding=encoding, newline='')
+        try:
+            return parse_csv_file(text_stream, date_format)
+        except UnicodeDecodeError:
+            continue
+        finally:
+            # Leave the upload's file open for FastAPI to close
+            text_stream.detach()
+
+
+def _do_ofx(fp: BinaryIO, date_format: str) -> List[ImportedTransaction]:
+    """Parse an uploaded OFX/QFX file (dates are typed, so date_format is unused)"""
+    # XML files are streamed from the upload; only SGML files are read into memory
+    transactions = _parse_ofx_xml(fp)
+    if transactions is not None:
+        return transactions
+    
+    fp.seek(0)
+    return _parse_ofx_with_ofxparse(fp.read())
+
+
+# Supported file extensions mapped to their parser
+_PARSERS: Dict[str, Callable[[BinaryIO, str], List[ImportedTransaction]]] = {
+    '.csv': _do_csv,
+    '.ofx': _do_ofx,
+    '.qfx': _do_ofx,
+}
+
+
+def parse_uploaded_file(file: UploadFile, date_format: str) -> Tuple[str, List[ImportedTransaction]]:
+    """
+    Dispatch an uploaded bank file to the parser for its extension.
+    Returns (file_type, transactions).
+    """
+    filename = file.filename.lower() if file.filename else ""
+    ext = os.path.splitext(filename)[1]
+    
+    parser = _PARSERS.get(ext)
+    if parser is None:
+        raise HTTPException(
+            status_code=400, 
+            detail="Unsupported file format. Please upload a CSV, OFX, or QFX file."
+        )
+    
+    return ext[1:], parser(file.file, date_format)
+
+
+def import_transactions(
+    db: Session,
+    account: Account,
+    transactions: List[ImportedTransaction],
+    default_category_id: Optional[int],
+    skip_duplicates: bool,
+    auto_categorize: bool
+) -> ImportResult:
+    """Categorize, de-duplicate, and insert parsed transactions into an account"""
+    account_id = account.id
+    
+    # Auto-categorize transactions if enabled
+    if auto_categorize:
+        auto_categorize_batch(transactions, load_categorizer(db))
+    
+    # Skip duplicates if requested (the check is only needed then)
+    skipped_count = 0
+    if skip_duplicates:
+        duplicate_flags, skipped_count = check_duplicates(transactions, account_id, db)
+        if skipped_count:
+            transactions = list(compress(transactions, [not flag for flag in duplicate_flags]))
+    
+    # Import transactions
+    rows = []
+    total_income = 0.0
+    total_expenses = 0.0
+    auto_categorized_count = 0
     
     for trans in transactions:
-        # Check for exact match on date, amount, and similar description
-        existing = db.query(Transaction).filter(
-            Transaction.account_id == account_id,
-            Transaction.transaction_date == trans.transaction_date,
-            Transaction.amount == trans.amount,
-            Transaction.transaction_type == trans.transaction_type
-        ).first()
+        # Determine category: use auto-detected category, or fall back to default
+        category_id = None
+        if trans.suggested_category_id:
+            category_id = trans.suggested_category_id
+            auto_categorized_count += 1
+        elif default_category_id:
+            category_id = default_category_id
         
-        duplicates.append(existing is not None)
+        rows.append({
+            "transaction_type": trans.transaction_type,
+            "amount": trans.amount,
+            "transaction_date": trans.transaction_date,
+            "payee": trans.payee,
+            "description": trans.description,
+            "account_id": account_id,
+            "category_id": category_id,
+            "is_reconciled": False
+        })
+        
+        if trans.transaction_type == TransactionType.INCOME:
+            total_income += trans.amount
+        else:
+            total_expenses += trans.amount
+    
+    # Insert all rows in one executemany instead of flushing ORM objects one by one
+    if rows:
+        db.execute(Transaction.__table__.insert(), rows)
+    
+    # Update account balance once
+    account.current_balance += total_income - total_expenses
+    
+    db.commit()
+    
+    imported_count = len(rows)
+    
+    return ImportResult(
+        imported_count=imported_count,
+        skipped_count=skipped_count,
+        total_income=total_income,
+        total_expenses=total_expenses,
+        auto_categorized_count=auto_categorized_count
+    )
+
+
+def run_import_job(
+    job_id: str,
+    account_id: int,
+    transactions: List[ImportedTransaction],
+    default_category_id: Optional[int],
+    skip_duplicates: bool,
+    auto_categorize: bool
+):
+    """Run an import in the background with its own database session"""
+    job = _get_import_job(job_id)
+    if job is None:
+        return
+    job.status = "running"
     
-    return duplicates
+    db = SessionLocal()
+    try:
+        account = db.query(Account).filter(Account.id == account_id).first()
+        if not account:
+            raise ValueError("Account not found")
+        
+        job.result = import_transactions(
+            db, account, transactions, default_category_id, skip_duplicates, auto_categorize
+        )
+        job.status = "completed"
+    except Exception as e:
+        db.rollback()
+        job.error = str(e)
+        job.status = "failed"
+    finally:
+        db.close()
 
 
+# Import endpoints are plain defs like the rest of the API: FastAPI runs them in its
+# threadpool, so parsing and the synchronous session never block the event loop
 @router.post("/preview", response_model=ImportPreview)
-async def preview_import(
+def preview_import(
     file: UploadFile = File(...),
     account_id: int = Form(...),
     date_format: str = Form("%m/%d/%Y"),
@@ -852,29 +1613,7 @@ async def preview_import(
         raise HTTPException(status_code=404, detail="Account not found")
     
     # Determine file type and parse
-    filename = file.filename.lower() if file.filename else ""
-    content = await file.read()
-    
-    transactions = []
-    file_type = "unknown"
-    
-    if filename.endswith('.csv'):
-        file_type = "csv"
-        try:
-            text_content = content.decode('utf-8')
-        except UnicodeDecodeError:
-            text_content = content.decode('latin-1')
-        transactions = parse_csv_file(text_content, date_format)
-    
-    elif filename.endswith(('.ofx', '.qfx')):
-        file_type = "ofx" if filename.endswith('.ofx') else "qfx"
-        transactions = parse_ofx_file(content)
-    
-    else:
-        raise HTTPException(
-            status_code=400, 
-            detail="Unsupported file format. Please upload a CSV, OFX, or QFX file."
-        )
+    file_type, transactions = parse_uploaded_file(file, date_format)
     
     if not transactions:
         raise HTTPException(status_code=400, detail="No transactions found in file")
@@ -886,35 +1625,42 @@ async def preview_import(
         transactions = flip_transaction_types(transactions)
     
     # Auto-categorize transactions
-    categorized_count = 0
-    for i, trans in enumerate(transactions):
-        transactions[i] = auto_categorize_transaction(trans, db)
-        if transactions[i].suggested_category_id:
-            categorized_count += 1
+    categorized_count = auto_categorize_batch(transactions, load_categorizer(db))
     
     # Check for duplicates
-    duplicate_flags = check_duplicates(transactions, account_id, db)
-    duplicates_count = sum(duplicate_flags)
-    
-    # Calculate totals
-    income_trans = [t for t in transactions if t.transaction_type == TransactionType.INCOME]
-    expense_trans = [t for t in transactions if t.transaction_type == TransactionType.EXPENSE]
-    
-    return ImportPreview(
+    _, duplicates_count = check_duplicates(transactions, account_id, db)
+    
+    # Calculate totals in one pass
+    income_count = expense_count = 0
+    total_income = total_expenses = 0.0
+    for t in transactions:
+        if t.transaction_type == TransactionType.INCOME:
+            income_count += 1
+            total_income += t.amount
+        elif t.transaction_type == TransactionType.EXPENSE:
+            expense_count += 1
+            total_expenses += t.amount
+    
+    preview = ImportPreview(
         transactions=transactions,
         total_count=len(transactions),
-        income_count=len(income_trans),
-        expense_count=len(expense_trans),
-        total_income=sum(t.amount for t in income_trans),
-        total_expenses=sum(t.amount for t in expense_trans),
+        income_count=income_count,
+        expense_count=expense_count,
+        total_income=total_income,
+        total_expenses=total_expenses,
         duplicates_count=duplicates_count,
         file_type=file_type,
         categorized_count=categorized_count
     )
+    
+    # Serialize directly; returning the model would make FastAPI dump and
+    # re-validate every transaction against response_model first
+    return ImportJSONResponse(preview.model_dump(mode='json'))
 
 
 @router.post("/execute", response_model=ImportResult)
-async def execute_import(
+def execute_import(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     account_id: int = Form(...),
     default_category_id: Optional[int] = Form(None),
@@ -922,6 +1668,7 @@ async def execute_import(
     date_format: str = Form("%m/%d/%Y"),
     auto_categorize: bool = Form(True),
     flip_types: Optional[bool] = Form(None),
+    background: bool = Form(False),
     db: Session = Depends(get_db)
 ):
     """
@@ -932,6 +1679,8 @@ async def execute_import(
         flip_types: If True, flip income/expense types. If False, don't flip.
                    If None (default), auto-detect based on account type
                    (flips for credit cards).
+        background: If True, parse the file and return 202 with a job id right away;
+                   the import runs afterwards and can be polled at /jobs/{job_id}.
     """
     # Verify account exists
     account = db.query(Account).filter(Account.id == account_id).first()
@@ -945,26 +1694,7 @@ async def execute_import(
             raise HTTPException(status_code=404, detail="Category not found")
     
     # Parse file
-    filename = file.filename.lower() if file.filename else ""
-    content = await file.read()
-    
-    transactions = []
-    
-    if filename.endswith('.csv'):
-        try:
-            text_content = content.decode('utf-8')
-        except UnicodeDecodeError:
-            text_content = content.decode('latin-1')
-        transactions = parse_csv_file(text_content, date_format)
-    
-    elif filename.endswith(('.ofx', '.qfx')):
-        transactions = parse_ofx_file(content)
-    
-    else:
-        raise HTTPException(
-            status_code=400, 
-            detail="Unsupported file format. Please upload a CSV, OFX, or QFX file."
-        )
+    _, transactions = parse_uploaded_file(file, date_format)
     
     if not transactions:
         raise HTTPException(status_code=400, detail="No transactions found in file")
@@ -975,89 +1705,60 @@ async def execute_import(
     if should_flip:
         transactions = flip_transaction_types(transactions)
     
-    # Auto-categorize transactions if enabled
-    if auto_categorize:
-        for i, trans in enumerate(transactions):
-            transactions[i] = auto_categorize_transaction(trans, db)
-    
-    # Check for duplicates
-    duplicate_flags = check_duplicates(transactions, account_id, db)
-    
-    # Import transactions
-    imported_count = 0
-    skipped_count = 0
-    total_income = 0.0
-    total_expenses = 0.0
-    auto_categorized_count = 0
-    
-    for i, trans in enumerate(transactions):
-        # Skip duplicates if requested
-        if skip_duplicates and duplicate_flags[i]:
-            skipped_count += 1
-            continue
-        
-        # Determine category: use auto-detected category, or fall back to default
-        category_id = None
-        if trans.suggested_category_id:
-            category_id = trans.suggested_category_id
-            auto_categorized_count += 1
-        elif default_category_id:
-            category_id = default_category_id
+    # Large files can be imported after the response is sent
+    if background:
+        job_id = uuid.uuid4().hex
+        job = _register_import_job(job_id)
         
-        # Create transaction
-        db_transaction = Transaction(
-            transaction_type=trans.transaction_type,
-            amount=trans.amount,
-            transaction_date=trans.transaction_date,
-            payee=trans.payee,
-            description=trans.description,
-            account_id=account_id,
-            category_id=category_id,
-            is_reconciled=0
+        background_tasks.add_task(
+            run_import_job, job_id, account_id, transactions,
+            default_category_id, skip_duplicates, auto_categorize
         )
-        
-        db.add(db_transaction)
-        
-        # Update account balance
-        if trans.transaction_type == TransactionType.INCOME:
-            account.current_balance += trans.amount
-            total_income += trans.amount
-        else:
-            account.current_balance -= trans.amount
-            total_expenses += trans.amount
-        
-        imported_count += 1
+        return ImportJSONResponse(status_code=202, content=job.model_dump(mode='json'))
     
-    db.commit()
-    
-    return ImportResult(
-        imported_count=imported_count,
-        skipped_count=skipped_count,
-        total_income=total_income,
-        total_expenses=total_expenses,
-        auto_categorized_count=auto_categorized_count
-    )
+    return import_transactions(db, account, transactions, default_category_id, skip_duplicates, auto_categorize)
+
+
+@router.get("/jobs/{job_id}", response_model=ImportJob)
+def get_import_job(job_id: str):
+    """Get the status of a background import job"""
+    job = _get_import_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    return job
+
+
+# Static format list, rendered once at import time
+SUPPORTED_FORMATS = {
+    "formats": [
+        {
+            "extension": "csv",
+            "name": "CSV (Comma-Separated Values)",
+            "description": "Standard CSV export from most banks. Must include date, description, and amount columns."
+        },
+        {
+            "extension": "ofx",
+            "name": "OFX (Open Financial Exchange)",
+            "description": "Standard financial data format supported by most banks."
+        },
+        {
+            "extension": "qfx",
+            "name": "QFX (Quicken Financial Exchange)",
+            "description": "Quicken-specific format, similar to OFX."
+        }
+    ]
+}
+_FORMATS_BODY = ImportJSONResponse(SUPPORTED_FORMATS).body
+_FORMATS_HEADERS = {
+    "Cache-Control": "public, max-age=86400",
+    "ETag": '"%s"' % hashlib.md5(_FORMATS_BODY).hexdigest(),
+}
 
 
 @router.get("/formats")
-def get_supported_formats():
+def get_supported_formats(if_none_match: Optional[str] = Header(None)):
     """Get list of supported import formats."""
-    return {
-        "formats": [
-            {
-                "extension": "csv",
-                "name": "CSV (Comma-Separated Values)",
-                "description": "Standard CSV export from most banks. Must include date, description, and amount columns."
-            },
-            {
-                "extension": "ofx",
-                "name": "OFX (Open Financial Exchange)",
-                "description": "Standard financial data format supported by most banks."
-            },
-            {
-                "extension": "qfx",
-                "name": "QFX (Quicken Financial Exchange)",
-                "description": "Quicken-specific format, similar to OFX."
-            }
-        ]
-    }
+    if if_none_match == _FORMATS_HEADERS["ETag"]:
+        return Response(status_code=304, headers=_FORMATS_HEADERS)
+    return Response(content=_FORMATS_BODY, media_type="application/json", headers=_FORMATS_HEADERS)
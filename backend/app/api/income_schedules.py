@@ -10,12 +10,62 @@ from app.schemas.income_schedule import (
     IncomeScheduleCreate, IncomeScheduleUpdate, 
     IncomeScheduleResponse, UpcomingIncome
 )
-from app.models.income_schedule import IncomeSchedule, IncomeFrequency
+from app.models.income_schedule import IncomeSchedule, IncomeFrequency, RESCHEDULE_FIELDS
 from app.models.account import Account
 from app.models.category import Category
 
 router = APIRouter()
 
+# Frequencies whose payments (after the first step) are a fixed number of days apart
+FIXED_INTERVAL_DAYS = {
+    IncomeFrequency.WEEKLY: 7,
+    IncomeFrequency.BIWEEKLY: 14,
+}
+
+
+# Columns count_occurrences needs; enough for IncomeSchedule.calculate_next_date
+SCHEDULE_DATE_COLUMNS = (
+    IncomeSchedule.frequency,
+    IncomeSchedule.start_date,
+    IncomeSchedule.next_expected_date,
+    IncomeSchedule.semimonthly_day1,
+    IncomeSchedule.semimonthly_day2,
+)
+
+
+def count_occurrences(schedule, start_date: date, end_date: date) -> int:
+    """
+    Count expected payments of a schedule between start_date and end_date (inclusive).
+    Accepts an IncomeSchedule or a row carrying the SCHEDULE_DATE_COLUMNS.
+    """
+    next_date = IncomeSchedule.calculate_next_date
+    current_date = schedule.next_expected_date
+    if current_date > end_date:
+        return 0
+    
+    count = 1 if current_date >= start_date else 0
+    interval = FIXED_INTERVAL_DAYS.get(schedule.frequency)
+    
+    if interval is None:
+        # Irregular month lengths; walk the schedule
+        current_date = next_date(schedule, current_date)
+        while current_date <= end_date:
+            if current_date >= start_date:
+                count += 1
+            current_date = next_date(schedule, current_date)
+        return count
+    
+    # The first step lines up with the schedule's weekday/fortnight; after that
+    # payments are evenly spaced, so count them arithmetically
+    first_date = next_date(schedule, current_date)
+    if first_date > end_date:
+        return count
+    
+    first_k = max(0, -(-(start_date - first_date).days // interval))  # ceiling division
+    last_k = (end_date - first_date).days // interval
+    return count + max(0, last_k - first_k + 1)
+
+
 
 @router.get("", response_model=List[IncomeScheduleResponse])
 def get_income_schedules(
@@ -27,7 +77,7 @@ def get_income_schedules(
     query = db.query(IncomeSchedule)
     
     if is_active is not None:
-        query = query.filter(IncomeSchedule.is_active == (1 if is_active else 0))
+        query = query.filter(IncomeSchedule.is_active == is_active)
     
     if account_id:
         query = query.filter(IncomeSchedule.account_id == account_id)
@@ -46,24 +96,18 @@ def get_upcoming_income(
     today = date.today()
     end_date = today + timedelta(days=days)
     
-    schedules = db.query(IncomeSchedule).filter(
-        IncomeSchedule.is_active == 1,
+    # Fetch account and category names in the same query
+    rows = db.query(IncomeSchedule, Account.name, Category.name).outerjoin(
+        Account, Account.id == IncomeSchedule.account_id
+    ).outerjoin(
+        Category, Category.id == IncomeSchedule.category_id
+    ).filter(
+        IncomeSchedule.is_active == True,
         IncomeSchedule.next_expected_date <= end_date
-    ).all()
+    ).order_by(IncomeSchedule.next_expected_date).all()
     
     upcoming = []
-    for schedule in schedules:
-        # Get account and category names
-        account_name = None
-        if schedule.account_id:
-            account = db.query(Account).filter(Account.id == schedule.account_id).first()
-            account_name = account.name if account else None
-        
-        category_name = None
-        if schedule.category_id:
-            category = db.query(Category).filter(Category.id == schedule.category_id).first()
-            category_name = category.name if category else None
-        
+    for schedule, account_name, category_name in rows:
         days_until = (schedule.next_expected_date - today).days
         
         upcoming.append(UpcomingIncome(
@@ -76,7 +120,7 @@ def get_upcoming_income(
             category_name=category_name
         ))
     
-    return sorted(upcoming, key=lambda x: x.expected_date)
+    return upcoming
 
 
 @router.get("/summary")
@@ -97,20 +141,22 @@ def get_income_summary(
     else:  # year
         end_date = today + timedelta(days=365)
     
-    schedules = db.query(IncomeSchedule).filter(IncomeSchedule.is_active == 1).all()
+    # Only the columns needed for the tally; skips ORM hydration
+    schedules = db.query(IncomeSchedule.amount, *SCHEDULE_DATE_COLUMNS).filter(
+        IncomeSchedule.is_active == True
+    )
     
     total_expected = 0.0
     income_count = 0
+    active_schedules = 0
     
-    for schedule in schedules:
-        current_date = schedule.next_expected_date
-        
+    # Stream rows in batches so memory stays flat however many schedules exist
+    for schedule in schedules.yield_per(500):
         # Count all occurrences within the period
-        while current_date <= end_date:
-            if current_date >= today:
-                total_expected += schedule.amount
-                income_count += 1
-            current_date = schedule.calculate_next_date(current_date)
+        occurrences = count_occurrences(schedule, today, end_date)
+        total_expected += occurrences * schedule.amount
+        income_count += occurrences
+        active_schedules += 1
     
     return {
         "period": period,
@@ -118,7 +164,7 @@ def get_income_summary(
         "end_date": end_date,
         "total_expected_income": round(total_expected, 2),
         "expected_payment_count": income_count,
-        "active_schedules": len(schedules)
+        "active_schedules": active_schedules
     }
 
 
@@ -169,7 +215,7 @@ def create_income_schedule(schedule: IncomeScheduleCreate, db: Session = Depends
         next_expected_date=schedule.start_date,
         semimonthly_day1=schedule.semimonthly_day1,
         semimonthly_day2=schedule.semimonthly_day2,
-        is_active=1
+        is_active=True
     )
     
     db.add(db_schedule)
@@ -206,20 +252,14 @@ def update_income_schedule(
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
     
-    # Track if we need to recalculate next_expected_date
-    recalculate_next_date = False
-    if "start_date" in update_data or "frequency" in update_data:
-        recalculate_next_date = True
-    
     for field, value in update_data.items():
-        if field == "is_active" and isinstance(value, bool):
-            setattr(db_schedule, field, 1 if value else 0)
-        else:
-            setattr(db_schedule, field, value)
-    
-    # Recalculate next_expected_date if start_date or frequency changed
-    if recalculate_next_date:
-        db_schedule.next_expected_date = db_schedule.start_date
+        setattr(db_schedule, field, value)
+    
+    # Resubmitted recurrence values leave the row clean, so the model's
+    # before_update hook wouldn't see them; recompute here as well
+    if (any(field in update_data for field in RESCHEDULE_FIELDS)
+            or db_schedule.next_expected_date < date.today()):
+        db_schedule.reschedule()
     
     db.commit()
     db.refresh(db_schedule)
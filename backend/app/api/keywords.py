@@ -1,9 +1,13 @@
 """Category Keywords API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+import base64
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Tuple
 
 from app.database import get_db
 from app.schemas.category_keyword import (
@@ -16,29 +20,61 @@ from app.models.category import Category
 
 # Import for testing against built-in keywords
 from app.api.imports import CATEGORY_KEYWORDS as BUILTIN_KEYWORDS
+from app.api.imports import invalidate_categorizer_cache, load_categorizer, _categorization_text
 
 router = APIRouter()
 
 
-def get_category_full_name(category: Category, db: Session) -> tuple[str, Optional[str]]:
+# Rows per UPDATE batch when applying recategorization results
+RECATEGORIZE_BATCH_SIZE = 1000
+
+# Uncategorized transactions examined for keyword suggestions
+SUGGEST_SAMPLE_SIZE = 1000
+
+# Loads each keyword's category and its parent in the same query
+WITH_CATEGORY = joinedload(CategoryKeyword.category).joinedload(Category.parent)
+
+
+def encode_keyword_cursor(keyword: CategoryKeyword) -> str:
+    """Opaque cursor for the listing position of a keyword"""
+    payload = json.dumps([keyword.priority, keyword.keyword]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_keyword_cursor(cursor: str) -> Tuple[int, str]:
+    """Decode a cursor from encode_keyword_cursor into (priority, keyword)"""
+    try:
+        priority, keyword = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(priority), str(keyword)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_category_full_name(category: Category) -> tuple[str, Optional[str]]:
     """Get category name and parent name"""
     if category.parent_id:
-        parent = db.query(Category).filter(Category.id == category.parent_id).first()
+        parent = category.parent
         return category.name, parent.name if parent else None
     return category.name, None
 
 
 @router.get("", response_model=List[CategoryKeywordWithCategory])
 def get_keywords(
+    response: Response,
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in keyword text"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Continue after a previous page (X-Next-Cursor header)"),
     db: Session = Depends(get_db)
 ):
-    """Get all category keywords with filtering and pagination"""
-    query = db.query(CategoryKeyword)
+    """
+    Get all category keywords with filtering and pagination.
+    When a full page is returned, the X-Next-Cursor response header holds a cursor
+    for the next page; passing it seeks past the previous page instead of using skip.
+    """
+    query = db.query(CategoryKeyword).options(WITH_CATEGORY)
     
     if category_id is not None:
         query = query.filter(CategoryKeyword.category_id == category_id)
@@ -47,20 +83,34 @@ def get_keywords(
         query = query.filter(CategoryKeyword.is_active == is_active)
     
     if search:
-        query = query.filter(CategoryKeyword.keyword.ilike(f"%{search.lower()}%"))
+        # Keywords are stored lowercase, so compare the column as-is instead of lower()-ing every row
+        query = query.filter(CategoryKeyword.keyword.contains(search.lower(), autoescape=True))
+    
+    if cursor:
+        # Keyset pagination: rows after (priority, keyword) in the listing order
+        last_priority, last_keyword = decode_keyword_cursor(cursor)
+        query = query.filter(or_(
+            CategoryKeyword.priority < last_priority,
+            and_(CategoryKeyword.priority == last_priority, CategoryKeyword.keyword > last_keyword)
+        ))
+    elif skip:
+        query = query.offset(skip)
     
     # Order by priority (descending) then by keyword
     keywords = query.order_by(
         CategoryKeyword.priority.desc(),
         CategoryKeyword.keyword
-    ).offset(skip).limit(limit).all()
+    ).limit(limit).all()
+    
+    if len(keywords) == limit:
+        response.headers["X-Next-Cursor"] = encode_keyword_cursor(keywords[-1])
     
     # Enrich with category names
     result = []
     for kw in keywords:
-        category = db.query(Category).filter(Category.id == kw.category_id).first()
+        category = kw.category
         if category:
-            cat_name, parent_name = get_category_full_name(category, db)
+            cat_name, parent_name = get_category_full_name(category)
             result.append(CategoryKeywordWithCategory(
                 id=kw.id,
                 keyword=kw.keyword,
@@ -107,24 +157,15 @@ def get_builtin_keywords(
     """Get list of built-in keywords for reference"""
     result = []
     
-    for keyword, (parent_name, subcategory_name) in BUILTIN_KEYWORDS.items():
-        if search and search.lower() not in keyword:
+    # Category ids for every built-in keyword, resolved once and cached with the categorizer
+    builtin_rules = load_categorizer(db).builtin_rules
+    search_lower = search.lower() if search else None
+    
+    for (keyword, (parent_name, subcategory_name)), rule in zip(BUILTIN_KEYWORDS.items(), builtin_rules):
+        if search_lower and search_lower not in keyword:
             continue
         
-        # Try to find the category in the database
-        parent = db.query(Category).filter(
-            Category.name == parent_name,
-            Category.parent_id == None
-        ).first()
-        
-        category_id = None
-        if parent:
-            subcategory = db.query(Category).filter(
-                Category.name == subcategory_name,
-                Category.parent_id == parent.id
-            ).first()
-            if subcategory:
-                category_id = subcategory.id
+        category_id = rule[0] if rule else None
         
         result.append({
             "keyword": keyword,
@@ -146,13 +187,13 @@ def get_builtin_keywords(
 @router.get("/{keyword_id}", response_model=CategoryKeywordWithCategory)
 def get_keyword(keyword_id: int, db: Session = Depends(get_db)):
     """Get a specific category keyword by ID"""
-    kw = db.query(CategoryKeyword).filter(CategoryKeyword.id == keyword_id).first()
+    kw = db.query(CategoryKeyword).options(WITH_CATEGORY).filter(CategoryKeyword.id == keyword_id).first()
     
     if not kw:
         raise HTTPException(status_code=404, detail="Keyword not found")
     
-    category = db.query(Category).filter(Category.id == kw.category_id).first()
-    cat_name, parent_name = get_category_full_name(category, db) if category else ("Unknown", None)
+    category = kw.category
+    cat_name, parent_name = get_category_full_name(category) if category else ("Unknown", None)
     
     return CategoryKeywordWithCategory(
         id=kw.id,
@@ -176,28 +217,27 @@ def create_keyword(keyword: CategoryKeywordCreate, db: Session = Depends(get_db)
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
     
-    # Check for duplicate keyword (same keyword text)
-    existing = db.query(CategoryKeyword).filter(
-        CategoryKeyword.keyword == keyword.keyword.lower()
-    ).first()
-    
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Keyword '{keyword.keyword}' already exists (ID: {existing.id})"
-        )
-    
-    db_keyword = CategoryKeyword(
+    # Insert unless the keyword text already exists; the unique index makes this atomic
+    stmt = sqlite_insert(CategoryKeyword).values(
         keyword=keyword.keyword.lower(),
         category_id=keyword.category_id,
         priority=keyword.priority,
         match_mode=keyword.match_mode,
         is_active=True
-    )
+    ).on_conflict_do_nothing(index_elements=['keyword']).returning(CategoryKeyword)
+    db_keyword = db.scalars(stmt).first()
+    
+    if db_keyword is None:
+        existing_id = db.query(CategoryKeyword.id).filter(
+            CategoryKeyword.keyword == keyword.keyword.lower()
+        ).scalar()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Keyword '{keyword.keyword}' already exists (ID: {existing_id})"
+        )
     
-    db.add(db_keyword)
     db.commit()
-    db.refresh(db_keyword)
+    invalidate_categorizer_cache()
     
     return db_keyword
 
@@ -205,43 +245,45 @@ def create_keyword(keyword: CategoryKeywordCreate, db: Session = Depends(get_db)
 @router.post("/bulk", response_model=BulkKeywordResult)
 def bulk_create_keywords(data: BulkKeywordCreate, db: Session = Depends(get_db)):
     """Create multiple category keywords at once"""
-    created_count = 0
     skipped_count = 0
     errors = []
     
+    # Validate categories in memory instead of per row
+    category_ids = {category_id for (category_id,) in db.query(Category.id)}
+    seen = set()
+    
+    rows = []
     for kw in data.keywords:
-        try:
-            # Verify category exists
-            category = db.query(Category).filter(Category.id == kw.category_id).first()
-            if not category:
-                errors.append(f"Category ID {kw.category_id} not found for keyword '{kw.keyword}'")
-                skipped_count += 1
-                continue
-            
-            # Check for duplicate
-            existing = db.query(CategoryKeyword).filter(
-                CategoryKeyword.keyword == kw.keyword.lower()
-            ).first()
-            
-            if existing:
-                skipped_count += 1
-                continue
-            
-            db_keyword = CategoryKeyword(
-                keyword=kw.keyword.lower(),
-                category_id=kw.category_id,
-                priority=kw.priority,
-                match_mode=kw.match_mode,
-                is_active=True
-            )
-            db.add(db_keyword)
-            created_count += 1
-            
-        except Exception as e:
-            errors.append(f"Error creating keyword '{kw.keyword}': {str(e)}")
+        # Verify category exists
+        if kw.category_id not in category_ids:
+            errors.append(f"Category ID {kw.category_id} not found for keyword '{kw.keyword}'")
+            skipped_count += 1
+            continue
+        
+        # Skip repeats within this batch; existing keywords are skipped by the insert.
+        # The schema has already stripped and lowercased the keyword.
+        keyword = kw.keyword
+        if keyword in seen:
             skipped_count += 1
+            continue
+        seen.add(keyword)
+        
+        rows.append({
+            "keyword": keyword,
+            "category_id": kw.category_id,
+            "priority": kw.priority,
+            "match_mode": kw.match_mode,
+            "is_active": True
+        })
     
-    db.commit()
+    # Single executemany insert; keywords that already exist are left alone
+    created_count = 0
+    if rows:
+        stmt = sqlite_insert(CategoryKeyword.__table__).on_conflict_do_nothing(index_elements=['keyword'])
+        created_count = db.execute(stmt, rows).rowcount
+        skipped_count += len(rows) - created_count
+        db.commit()
+        invalidate_categorizer_cache()
     
     return BulkKeywordResult(
         created_count=created_count,
@@ -288,6 +330,7 @@ def update_keyword(
         setattr(db_keyword, field, value)
     
     db.commit()
+    invalidate_categorizer_cache()
     db.refresh(db_keyword)
     
     return db_keyword
@@ -303,6 +346,7 @@ def delete_keyword(keyword_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_keyword)
     db.commit()
+    invalidate_categorizer_cache()
     
     return {"message": "Keyword deleted successfully"}
 
@@ -312,6 +356,7 @@ def delete_all_keywords(db: Session = Depends(get_db)):
     """Delete all user-defined keywords"""
     count = db.query(CategoryKeyword).delete(synchronize_session=False)
     db.commit()
+    invalidate_categorizer_cache()
     
     return {
         "message": f"Deleted {count} keywords",
@@ -326,53 +371,33 @@ def test_keyword_match(request: TestKeywordRequest, db: Session = Depends(get_db
     This helps users understand how the auto-categorization will work.
     """
     text = request.text
-    text_lower = text.lower()
-    
-    # First check user-defined keywords (higher priority)
-    user_keywords = db.query(CategoryKeyword).filter(
-        CategoryKeyword.is_active == True
-    ).order_by(CategoryKeyword.priority.desc()).all()
-    
-    for kw in user_keywords:
-        if kw.matches(text):
-            category = db.query(Category).filter(Category.id == kw.category_id).first()
-            if category:
-                cat_name, parent_name = get_category_full_name(category, db)
-                full_name = f"{parent_name} > {cat_name}" if parent_name else cat_name
-                
-                return TestKeywordResult(
-                    text=text,
-                    matched=True,
-                    matched_keyword=kw.keyword,
-                    category_id=kw.category_id,
-                    category_name=full_name,
-                    match_source='user'
-                )
-    
-    # Then check built-in keywords
-    for keyword, (parent_name, subcategory_name) in BUILTIN_KEYWORDS.items():
-        if keyword in text_lower:
-            # Look up category in database
-            parent = db.query(Category).filter(
-                Category.name == parent_name,
-                Category.parent_id == None
-            ).first()
-            
-            if parent:
-                subcategory = db.query(Category).filter(
-                    Category.name == subcategory_name,
-                    Category.parent_id == parent.id
-                ).first()
-                
-                if subcategory:
-                    return TestKeywordResult(
-                        text=text,
-                        matched=True,
-                        matched_keyword=keyword,
-                        category_id=subcategory.id,
-                        category_name=f"{parent_name} > {subcategory_name}",
-                        match_source='builtin'
-                    )
+    
+    # First check user-defined keywords (higher priority), using the cached rule automaton
+    categorizer = load_categorizer(db)
+    user_match = categorizer.first_user_rule(text)
+    if user_match:
+        matched_keyword, category_id, full_name = user_match
+        return TestKeywordResult(
+            text=text,
+            matched=True,
+            matched_keyword=matched_keyword,
+            category_id=category_id,
+            category_name=full_name,
+            match_source='user'
+        )
+    
+    # Then check built-in keywords in one pass over the text
+    builtin_match = categorizer.first_builtin_rule(text)
+    if builtin_match:
+        matched_keyword, category_id, full_name = builtin_match
+        return TestKeywordResult(
+            text=text,
+            matched=True,
+            matched_keyword=matched_keyword,
+            category_id=category_id,
+            category_name=full_name,
+            match_source='builtin'
+        )
     
     return TestKeywordResult(
         text=text,
@@ -392,23 +417,22 @@ def suggest_keywords_from_transactions(
     from app.models.transaction import Transaction
     from collections import Counter
     
-    # Get uncategorized transactions
-    uncategorized = db.query(Transaction).filter(
-        Transaction.category_id == None
-    ).limit(1000).all()
+    # Only the payee column of the first uncategorized rows; no ORM objects
+    payees = db.scalars(
+        select(Transaction.payee).where(Transaction.category_id == None).limit(SUGGEST_SAMPLE_SIZE)
+    ).all()
     
-    if not uncategorized:
+    if not payees:
         return {
             "suggestions": [],
             "message": "No uncategorized transactions found"
         }
     
-    # Count payee occurrences
+    # Normalized in Python so str.strip()/lower() semantics (all whitespace, Unicode case) hold
     payee_counter = Counter()
-    for trans in uncategorized:
-        if trans.payee:
-            # Normalize payee
-            payee = trans.payee.strip().lower()
+    for payee in payees:
+        if payee:
+            payee = payee.strip().lower()
             if len(payee) >= 3:
                 payee_counter[payee] += 1
     
@@ -424,7 +448,8 @@ def suggest_keywords_from_transactions(
     
     return {
         "suggestions": suggestions,
-        "total_uncategorized": len(uncategorized),
+        # Uncategorized transactions examined (at most SUGGEST_SAMPLE_SIZE)
+        "total_uncategorized": len(payees),
         "unique_payees": len(payee_counter)
     }
 
@@ -441,76 +466,114 @@ def recategorize_transactions(
     Use dry_run=true to preview what would be changed.
     """
     from app.models.transaction import Transaction, TransactionType
-    from app.api.imports import find_category_by_keywords
     
-    # Get transactions to process
-    query = db.query(Transaction).filter(
-        Transaction.transaction_type.in_([TransactionType.INCOME, TransactionType.EXPENSE])
-    )
+    # Keyword rules compiled once (per-type automata, resolved category names)
+    categorizer = load_categorizer(db)
     
+    base_filters = [
+        Transaction.transaction_type.in_([TransactionType.INCOME, TransactionType.EXPENSE])
+    ]
     if only_uncategorized:
-        query = query.filter(Transaction.category_id == None)
+        base_filters.append(Transaction.category_id == None)
     
-    transactions = query.all()
+    # Rows already evaluated against this exact rule set would come out the same
+    filters = base_filters + [
+        or_(
+            Transaction.categorization_version == None,
+            Transaction.categorization_version != categorizer.version
+        )
+    ]
+    skipped = db.query(func.count(Transaction.id)).filter(
+        *base_filters, Transaction.categorization_version == categorizer.version
+    ).scalar()
     
-    if not transactions:
-        return {
-            "message": "No transactions to process",
-            "processed": 0,
-            "categorized": 0,
-            "changes": []
-        }
+    # Get transactions to process, with their current category names in the same query
+    query = db.query(Transaction).options(
+        joinedload(Transaction.category).joinedload(Category.parent)
+    ).filter(*filters)
     
     changes = []
-    categorized_count = 0
-    
-    for trans in transactions:
-        # Combine payee and description for matching
-        search_text = " ".join(filter(None, [trans.payee, trans.description]))
+    change_count = 0
+    processed = 0
+    # (id, new category) pairs; applied after the scan so the open cursor
+    # never walks rows whose category_id it has just changed
+    pending = []
+    last_id = 0
+    
+    # Stream rows in batches instead of loading every transaction at once
+    for trans in query.yield_per(500):
+        processed += 1
+        last_id = max(last_id, trans.id)
+        
+        # Same text the import path matches (stored rows have no original description)
+        search_text = _categorization_text(trans.payee, trans.description)
         
         if not search_text:
             continue
         
         # Find matching category
-        result = find_category_by_keywords(search_text, trans.transaction_type, db)
+        result = categorizer.match(search_text, trans.transaction_type)
         
         if result:
             new_category_id, category_name = result
             
             # Check if this would be a change
             if trans.category_id != new_category_id:
+                change_count += 1
+                if not dry_run:
+                    pending.append({"id": trans.id, "category_id": new_category_id})
+                
+                # Only the first changes are returned; keep the rest as a count
+                if len(changes) >= 100:
+                    continue
+                
                 old_category_name = None
-                if trans.category_id:
-                    old_cat = db.query(Category).filter(Category.id == trans.category_id).first()
-                    if old_cat:
-                        old_name, old_parent = get_category_full_name(old_cat, db)
-                        old_category_name = f"{old_parent} > {old_name}" if old_parent else old_name
+                if trans.category:
+                    old_name, old_parent = get_category_full_name(trans.category)
+                    old_category_name = f"{old_parent} > {old_name}" if old_parent else old_name
                 
-                change = {
+                changes.append({
                     "transaction_id": trans.id,
                     "payee": trans.payee,
                     "description": trans.description,
                     "amount": trans.amount,
-                    "date": str(trans.transaction_date),
+                    "date": trans.transaction_date,
                     "old_category": old_category_name,
                     "new_category": category_name,
                     "new_category_id": new_category_id
-                }
-                changes.append(change)
-                
-                if not dry_run:
-                    trans.category_id = new_category_id
-                    categorized_count += 1
+                })
     
-    if not dry_run and categorized_count > 0:
+    if not processed:
+        return {
+            # An empty scan means either no matching transactions or nothing left to re-evaluate
+            "message": "All transactions are up to date with the current rules" if skipped else "No transactions to process",
+            "processed": 0,
+            "skipped": skipped,
+            "categorized": 0,
+            "dry_run": dry_run,
+            "only_uncategorized": only_uncategorized,
+            "changes": []
+        }
+    
+    if not dry_run:
+        # Mark everything scanned as evaluated (before the category changes below move
+        # rows out of the only_uncategorized filter); updated_at is left untouched
+        db.query(Transaction).filter(*filters, Transaction.id <= last_id).update({
+            Transaction.categorization_version: categorizer.version,
+            Transaction.updated_at: Transaction.updated_at
+        }, synchronize_session=False)
+        
+        # Batched executemany UPDATEs keyed by primary key
+        for start in range(0, len(pending), RECATEGORIZE_BATCH_SIZE):
+            db.bulk_update_mappings(Transaction, pending[start:start + RECATEGORIZE_BATCH_SIZE])
         db.commit()
     
     return {
-        "message": f"{'Would categorize' if dry_run else 'Categorized'} {len(changes)} transaction(s)",
-        "processed": len(transactions),
-        "categorized": len(changes),
+        "message": f"{'Would categorize' if dry_run else 'Categorized'} {change_count} transaction(s)",
+        "processed": processed,
+        "skipped": skipped,  # Already evaluated against the current rules
+        "categorized": change_count,
         "dry_run": dry_run,
         "only_uncategorized": only_uncategorized,
-        "changes": changes[:100]  # Limit response size
+        "changes": changes  # Limited to the first 100 to keep the response small
     }
-
@@ -1,20 +1,62 @@
 """Reports API endpoints"""
 
+import functools
+import threading
+from collections import OrderedDict
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func
 from typing import Optional
 from datetime import date, datetime
 
-from app.database import get_db
+from app.database import get_db, get_data_version
 from app.models.transaction import Transaction, TransactionType
 from app.models.category import Category
-from app.models.account import Account
+from app.models.account import Account, AccountType
 
 router = APIRouter()
 
+# Account types whose balances count as debt rather than assets
+LIABILITY_ACCOUNT_TYPES = frozenset([AccountType.CREDIT_CARD, AccountType.LOAN])
+
+# Most recent report results kept in memory; dashboards re-request the same ranges
+REPORT_CACHE_SIZE = 64
+_report_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_report_cache_lock = threading.Lock()
+
+
+def cached_report(handler):
+    """
+    Cache a report handler's result by its query parameters.
+    Entries are tagged with the data version and ignored once anything is committed.
+    """
+    @functools.wraps(handler)
+    def wrapper(**kwargs):
+        key = (handler.__name__,) + tuple(sorted((k, v) for k, v in kwargs.items() if k != 'db'))
+        # Read the version first so a commit during the query leaves a stale tag, not stale data
+        version = get_data_version()
+        
+        with _report_cache_lock:
+            cached = _report_cache.get(key)
+            if cached and cached[0] == version:
+                _report_cache.move_to_end(key)
+                return cached[1]
+        
+        result = handler(**kwargs)
+        
+        with _report_cache_lock:
+            _report_cache[key] = (version, result)
+            _report_cache.move_to_end(key)
+            while len(_report_cache) > REPORT_CACHE_SIZE:
+                _report_cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
 
 @router.get("/spending-by-category")
+@cached_report
 def get_spending_by_category(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -67,8 +109,6 @@ def get_income_vs_expenses(
     db: Session = Depends(get_db)
 ):
     """Get income vs expenses comparison"""
-    query = db.query(Transaction)
-    
     filters = [
         Transaction.transaction_date >= start_date,
         Transaction.transaction_date <= end_date,
@@ -78,25 +118,13 @@ def get_income_vs_expenses(
     if account_id:
         filters.append(Transaction.account_id == account_id)
     
-    query = query.filter(and_(*filters))
-    
-    income = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.transaction_type == TransactionType.INCOME,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= end_date,
-            Transaction.account_id == account_id if account_id else True
-        )
-    ).scalar() or 0.0
-    
-    expenses = db.query(func.sum(Transaction.amount)).filter(
-        and_(
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= end_date,
-            Transaction.account_id == account_id if account_id else True
-        )
-    ).scalar() or 0.0
+    # Both totals from one pass using conditional sums
+    income, expenses = db.query(
+        func.sum(case((Transaction.transaction_type == TransactionType.INCOME, Transaction.amount), else_=0)),
+        func.sum(case((Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount), else_=0))
+    ).filter(and_(*filters)).one()
+    income = income or 0.0
+    expenses = expenses or 0.0
     
     net = income - expenses
     
@@ -122,29 +150,35 @@ def get_income_vs_expenses(
 @router.get("/account-balances")
 def get_account_balances(db: Session = Depends(get_db)):
     """Get current balances for all accounts"""
-    accounts = db.query(Account).filter(Account.is_active == True).all()
-    
-    total_assets = sum(
-        acc.current_balance for acc in accounts
-        if acc.account_type.value not in ['credit_card', 'loan']
-    )
-    
-    total_liabilities = sum(
-        abs(acc.current_balance) for acc in accounts
-        if acc.account_type.value in ['credit_card', 'loan']
-    )
+    # Only the columns the response needs; no ORM objects
+    rows = db.query(
+        Account.id,
+        Account.name,
+        Account.account_type,
+        Account.current_balance,
+        Account.currency
+    ).filter(Account.is_active == True).all()
+    
+    accounts = []
+    total_assets = 0
+    total_liabilities = 0
+    
+    for account_id, name, account_type, balance, currency in rows:
+        if account_type in LIABILITY_ACCOUNT_TYPES:
+            total_liabilities += abs(balance)
+        else:
+            total_assets += balance
+        
+        accounts.append({
+            "id": account_id,
+            "name": name,
+            "type": account_type.value,
+            "balance": balance,
+            "currency": currency
+        })
     
     return {
-        "accounts": [
-            {
-                "id": acc.id,
-                "name": acc.name,
-                "type": acc.account_type.value,
-                "balance": acc.current_balance,
-                "currency": acc.currency
-            }
-            for acc in accounts
-        ],
+        "accounts": accounts,
         "total_assets": total_assets,
         "total_liabilities": total_liabilities,
         "net_worth": total_assets - total_liabilities
@@ -164,29 +198,30 @@ def get_balance_trend(
     if not account:
         return {"error": "Account not found"}
     
-    # Get all transactions for the account in the period
-    transactions = db.query(Transaction).filter(
+    # Running balance computed by the database with a window sum over the period
+    delta = case(
+        (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+        (Transaction.transaction_type == TransactionType.EXPENSE, -Transaction.amount),
+        else_=0
+    )
+    running_total = func.sum(delta).over(order_by=[Transaction.transaction_date, Transaction.id])
+    
+    rows = db.query(Transaction.transaction_date, running_total).filter(
         and_(
             Transaction.transaction_date >= start_date,
             Transaction.transaction_date <= end_date
         ),
         Transaction.account_id == account_id
-    ).order_by(Transaction.transaction_date).all()
-    
-    # Calculate running balance
-    balance_points = []
-    current_balance = account.initial_balance
-    
-    for txn in transactions:
-        if txn.transaction_type == TransactionType.INCOME:
-            current_balance += txn.amount
-        elif txn.transaction_type == TransactionType.EXPENSE:
-            current_balance -= txn.amount
-        
-        balance_points.append({
-            "date": txn.transaction_date.isoformat(),
-            "balance": current_balance
-        })
+    ).order_by(Transaction.transaction_date, Transaction.id).all()
+    
+    initial_balance = account.initial_balance
+    balance_points = [
+        {
+            "date": transaction_date.isoformat(),
+            "balance": initial_balance + running
+        }
+        for transaction_date, running in rows
+    ]
     
     return {
         "account_id": account_id,
@@ -198,6 +233,7 @@ def get_balance_trend(
 
 
 @router.get("/money-flow")
+@cached_report
 def get_money_flow(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -215,8 +251,9 @@ def get_money_flow(
     if account_id:
         date_filters.append(Transaction.account_id == account_id)
     
-    # Get income by category
-    income_data = db.query(
+    # Income and expense totals by category in a single grouped query
+    category_totals = db.query(
+        Transaction.transaction_type,
         Category.name,
         Category.color,
         func.sum(Transaction.amount).label('total')
@@ -224,96 +261,76 @@ def get_money_flow(
         Transaction, Transaction.category_id == Category.id
     ).filter(
         and_(
-            Transaction.transaction_type == TransactionType.INCOME,
+            Transaction.transaction_type.in_([TransactionType.INCOME, TransactionType.EXPENSE]),
             *date_filters
         )
-    ).group_by(Category.id).all()
-    
-    # Get expenses by category (parent categories)
-    expense_data = db.query(
-        Category.name,
-        Category.color,
-        func.sum(Transaction.amount).label('total')
-    ).join(
-        Transaction, Transaction.category_id == Category.id
-    ).filter(
-        and_(
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            *date_filters
-        )
-    ).group_by(Category.id).order_by(func.sum(Transaction.amount).desc()).all()
+    ).group_by(Transaction.transaction_type, Category.id).order_by(Category.id).all()
+    
+    income_data = [r for r in category_totals if r.transaction_type == TransactionType.INCOME]
+    # Largest expense categories first
+    expense_data = sorted(
+        (r for r in category_totals if r.transaction_type == TransactionType.EXPENSE),
+        key=lambda r: r.total,
+        reverse=True
+    )
     
     # Calculate totals
     total_income = sum(r.total for r in income_data)
     total_expenses = sum(r.total for r in expense_data)
     savings = total_income - total_expenses
     
-    # Build nodes list
+    # Nodes are laid out as: income sources, the central budget node, expense
+    # categories, then savings; links are built alongside using those positions
     nodes = []
-    node_index = {}
+    links = []
+    budget_index = len(income_data)
     
-    # Add income nodes
-    for r in income_data:
-        node_index[f"income_{r.name}"] = len(nodes)
+    # Income sources -> Budget
+    for position, r in enumerate(income_data):
         nodes.append({
             "name": r.name,
             "color": r.color or "#52c41a",
             "type": "income"
         })
+        links.append({
+            "source": position,
+            "target": budget_index,
+            "value": float(r.total)
+        })
     
     # Add central "Budget" node
-    budget_index = len(nodes)
     nodes.append({
         "name": "Total Budget",
         "color": "#1890ff",
         "type": "budget"
     })
     
-    # Add expense nodes
+    # Budget -> Expense categories
     for r in expense_data:
-        node_index[f"expense_{r.name}"] = len(nodes)
+        links.append({
+            "source": budget_index,
+            "target": len(nodes),
+            "value": float(r.total)
+        })
         nodes.append({
             "name": r.name,
             "color": r.color or "#ff4d4f",
             "type": "expense"
         })
     
-    # Add savings node if positive
+    # Budget -> Savings, if positive
     if savings > 0:
-        savings_index = len(nodes)
+        links.append({
+            "source": budget_index,
+            "target": len(nodes),
+            "value": float(savings)
+        })
         nodes.append({
             "name": "Savings",
             "color": "#52c41a",
             "type": "savings"
         })
     
-    # Build links
-    links = []
-    
-    # Income sources -> Budget
-    for r in income_data:
-        links.append({
-            "source": node_index[f"income_{r.name}"],
-            "target": budget_index,
-            "value": float(r.total)
-        })
-    
-    # Budget -> Expense categories
-    for r in expense_data:
-        links.append({
-            "source": budget_index,
-            "target": node_index[f"expense_{r.name}"],
-            "value": float(r.total)
-        })
-    
-    # Budget -> Savings
-    if savings > 0:
-        links.append({
-            "source": budget_index,
-            "target": savings_index,
-            "value": float(savings)
-        })
-    
     return {
         "start_date": start_date,
         "end_date": end_date,
@@ -1,31 +1,114 @@
 """Transaction API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+import base64
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, bindparam, case, column, or_, select, table, text, tuple_, update
+from typing import Dict, List, Optional, Tuple
 from datetime import date, datetime
 
-from app.database import get_db
+from app.database import get_db, begin_immediate
 from app.schemas.transaction import TransactionCreate, TransactionUpdate, TransactionResponse
 from app.models.transaction import Transaction, TransactionType
 from app.models.account import Account
 
 router = APIRouter()
 
+# Fields whose change invalidates a transaction's keyword categorization
+RECATEGORIZE_FIELDS = frozenset(["payee", "description", "category_id", "transaction_type"])
+
+# FTS5 trigram index over payee/description (migration 013); needs 3+ characters to match
+transactions_fts = table("transactions_fts", column("rowid"))
+FTS_MIN_SEARCH_LENGTH = 3
+_search_index_available: Optional[bool] = None
+
+# Accounts a transaction moves money on, as (account field, sign of the amount) per type
+BALANCE_LEGS = {
+    TransactionType.INCOME: (("account_id", 1),),
+    TransactionType.EXPENSE: (("account_id", -1),),
+    TransactionType.TRANSFER: (("from_account_id", -1), ("to_account_id", 1)),
+}
+
+# Columns add_transaction_balance reads, for reversing a row without loading the entity
+BALANCE_COLUMNS = (
+    Transaction.transaction_type, Transaction.account_id,
+    Transaction.from_account_id, Transaction.to_account_id, Transaction.amount
+)
+
+
+def add_balance_change(deltas: Dict[int, float], account_id: Optional[int], amount: float):
+    """Accumulate a signed balance change for an account"""
+    if account_id is not None:
+        deltas[account_id] = deltas.get(account_id, 0.0) + amount
+
+
+def add_transaction_balance(deltas: Dict[int, float], transaction, sign: int = 1):
+    """Accumulate a transaction's effect on account balances; sign=-1 reverses it"""
+    for field, direction in BALANCE_LEGS.get(transaction.transaction_type, ()):
+        add_balance_change(deltas, getattr(transaction, field), sign * direction * transaction.amount)
+
+
+def apply_balance_changes(db: Session, deltas: Dict[int, float]):
+    """Apply accumulated balance changes to all affected accounts with one UPDATE"""
+    deltas = {account_id: amount for account_id, amount in deltas.items() if amount}
+    if not deltas:
+        return
+    
+    db.execute(
+        update(Account)
+        .where(Account.id.in_(deltas))
+        .values(current_balance=Account.current_balance + case(deltas, value=Account.id))
+        .execution_options(synchronize_session=False)
+    )
+
+
+# Unfiltered listing (the dashboard default), built once and run with bound limit/offset;
+# TransactionResponse only carries foreign key ids, so lazy relationship loads are errors
+LIST_TRANSACTIONS = (
+    select(Transaction)
+    .options(raiseload("*"))
+    .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+    .limit(bindparam("limit"))
+    .offset(bindparam("skip"))
+)
+
+
+def has_search_index(db: Session) -> bool:
+    """Whether the FTS search table exists; checked once per process"""
+    global _search_index_available
+    if _search_index_available is None:
+        _search_index_available = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'")
+        ).first() is not None
+    return _search_index_available
+
+
+def encode_transaction_cursor(transaction: Transaction) -> str:
+    """Opaque cursor for the listing position of a transaction"""
+    payload = json.dumps([transaction.transaction_date.isoformat(), transaction.id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
 
-def update_account_balance(db: Session, account_id: int, amount: float, is_addition: bool):
-    """Update account balance"""
-    account = db.query(Account).filter(Account.id == account_id).first()
-    if account:
-        if is_addition:
-            account.current_balance += amount
-        else:
-            account.current_balance -= amount
+def decode_transaction_cursor(cursor: str) -> Tuple[date, int]:
+    """Decode a cursor from encode_transaction_cursor into (transaction_date, id)"""
+    try:
+        transaction_date, transaction_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return date.fromisoformat(transaction_date), int(transaction_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def set_next_cursor(response: Response, transactions: List[Transaction], limit: int):
+    """Point X-Next-Cursor past a full page; a short page means there is no next one"""
+    if len(transactions) == limit:
+        response.headers["X-Next-Cursor"] = encode_transaction_cursor(transactions[-1])
 
 
 @router.get("", response_model=List[TransactionResponse])
 def get_transactions(
+    response: Response,
     account_id: Optional[int] = None,
     category_id: Optional[int] = None,
     transaction_type: Optional[TransactionType] = None,
@@ -34,10 +117,20 @@ def get_transactions(
     search: Optional[str] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Continue after a previous page (X-Next-Cursor header)"),
     db: Session = Depends(get_db)
 ):
-    """Get transactions with filters"""
-    query = db.query(Transaction)
+    """
+    Get transactions with filters, newest first.
+    When a full page is returned, the X-Next-Cursor response header holds a cursor
+    for the next page; passing it seeks past the previous page instead of using skip.
+    """
+    if not any((account_id, category_id, transaction_type, start_date, end_date, search, cursor)):
+        transactions = db.scalars(LIST_TRANSACTIONS, {"limit": limit, "skip": skip}).all()
+        set_next_cursor(response, transactions, limit)
+        return transactions
+    
+    query = db.query(Transaction).options(raiseload("*"))
     
     if account_id:
         query = query.filter(
@@ -60,7 +153,14 @@ def get_transactions(
     if end_date:
         query = query.filter(Transaction.transaction_date <= end_date)
     
-    if search:
+    if search and len(search) >= FTS_MIN_SEARCH_LENGTH and has_search_index(db):
+        # Quoted trigram phrase: matches the term anywhere in payee or description
+        fts_query = '"' + search.replace('"', '""') + '"'
+        query = query.filter(Transaction.id.in_(
+            select(transactions_fts.c.rowid)
+            .where(text("transactions_fts MATCH :fts_query").bindparams(fts_query=fts_query))
+        ))
+    elif search:
         search_term = f"%{search}%"
         query = query.filter(
             or_(
@@ -69,7 +169,23 @@ def get_transactions(
             )
         )
     
-    return query.order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+    if cursor:
+        # Keyset pagination: rows after (transaction_date, id) in the listing order
+        last_date, last_id = decode_transaction_cursor(cursor)
+        query = query.filter(
+            tuple_(Transaction.transaction_date, Transaction.id) < tuple_(last_date, last_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+    
+    transactions = query.order_by(
+        Transaction.transaction_date.desc(),
+        Transaction.id.desc()
+    ).limit(limit).all()
+    
+    set_next_cursor(response, transactions, limit)
+    
+    return transactions
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
@@ -86,6 +202,10 @@ def get_transaction(transaction_id: int, db: Session = Depends(get_db)):
 @router.post("", response_model=TransactionResponse, status_code=201)
 def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_db)):
     """Create new transaction"""
+    # The response is built from the object in memory; don't re-SELECT it after commit
+    db.expire_on_commit = False
+    # Take the write lock first so the row and its balance change commit together
+    begin_immediate(db)
     
     # Create transaction
     db_transaction = Transaction(
@@ -98,25 +218,17 @@ def create_transaction(transaction: TransactionCreate, db: Session = Depends(get
         category_id=transaction.category_id,
         from_account_id=transaction.from_account_id,
         to_account_id=transaction.to_account_id,
-        is_reconciled=0
+        is_reconciled=False,
+        created_at=datetime.utcnow()  # Set here so the response needn't re-read the server default
     )
     
     db.add(db_transaction)
-    db.flush()  # Get transaction ID
     
     # Update account balances
-    if transaction.transaction_type == TransactionType.INCOME:
-        update_account_balance(db, transaction.account_id, transaction.amount, True)
-    
-    elif transaction.transaction_type == TransactionType.EXPENSE:
-        update_account_balance(db, transaction.account_id, transaction.amount, False)
-    
-    elif transaction.transaction_type == TransactionType.TRANSFER:
-        update_account_balance(db, transaction.from_account_id, transaction.amount, False)
-        update_account_balance(db, transaction.to_account_id, transaction.amount, True)
-    
+    deltas = {}
+    add_transaction_balance(deltas, db_transaction)
+    apply_balance_changes(db, deltas)
     db.commit()
-    db.refresh(db_transaction)
     
     return db_transaction
 
@@ -128,41 +240,45 @@ def update_transaction(
     db: Session = Depends(get_db)
 ):
     """Update transaction"""
-    db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
+    # The response is the RETURNING row; don't re-SELECT it after commit
+    db.expire_on_commit = False
+    # Lock before reading the old amount so concurrent edits can't reverse it twice
+    begin_immediate(db)
     
-    if not db_transaction:
+    old_transaction = db.query(*BALANCE_COLUMNS).filter(Transaction.id == transaction_id).first()
+    
+    if not old_transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
-    # Reverse old balance changes
-    if db_transaction.transaction_type == TransactionType.INCOME:
-        update_account_balance(db, db_transaction.account_id, db_transaction.amount, False)
-    elif db_transaction.transaction_type == TransactionType.EXPENSE:
-        update_account_balance(db, db_transaction.account_id, db_transaction.amount, True)
-    elif db_transaction.transaction_type == TransactionType.TRANSFER:
-        update_account_balance(db, db_transaction.from_account_id, db_transaction.amount, True)
-        update_account_balance(db, db_transaction.to_account_id, db_transaction.amount, False)
-    
-    # Update fields
-    update_data = transaction.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        if field == "is_reconciled" and value:
-            setattr(db_transaction, field, 1)
-            setattr(db_transaction, "reconciled_date", datetime.now())
-        else:
-            setattr(db_transaction, field, value)
+    # Reverse old balance changes; old and new legs are netted into one UPDATE,
+    # so edits that leave amount, type and accounts alone don't touch balances
+    deltas = {}
+    add_transaction_balance(deltas, old_transaction, -1)
+    
+    # Update fields with one UPDATE of just the submitted columns
+    values = transaction.model_dump(exclude_unset=True)
+    if values.get("is_reconciled"):
+        values["reconciled_date"] = datetime.now()
+    
+    # Set explicitly rather than via onupdate, which would leave it expired after the UPDATE
+    values["updated_at"] = datetime.utcnow()
+    
+    # Keyword recategorization has to look at this row again
+    if RECATEGORIZE_FIELDS.intersection(values):
+        values["categorization_version"] = None
+    
+    db_transaction = db.scalars(
+        update(Transaction)
+        .where(Transaction.id == transaction_id)
+        .values(**values)
+        .returning(Transaction)
+    ).one()
     
     # Apply new balance changes
-    new_amount = update_data.get("amount", db_transaction.amount)
-    if db_transaction.transaction_type == TransactionType.INCOME:
-        update_account_balance(db, db_transaction.account_id, new_amount, True)
-    elif db_transaction.transaction_type == TransactionType.EXPENSE:
-        update_account_balance(db, db_transaction.account_id, new_amount, False)
-    elif db_transaction.transaction_type == TransactionType.TRANSFER:
-        update_account_balance(db, db_transaction.from_account_id, new_amount, False)
-        update_account_balance(db, db_transaction.to_account_id, new_amount, True)
+    add_transaction_balance(deltas, db_transaction)
     
+    apply_balance_changes(db, deltas)
     db.commit()
-    db.refresh(db_transaction)
     
     return db_transaction
 
@@ -170,20 +286,19 @@ def update_transaction(
 @router.delete("/{transaction_id}")
 def delete_transaction(transaction_id: int, db: Session = Depends(get_db)):
     """Delete transaction"""
+    # Lock before reading the amount being reversed
+    begin_immediate(db)
+    
     db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
     
     if not db_transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
     # Reverse balance changes
-    if db_transaction.transaction_type == TransactionType.INCOME:
-        update_account_balance(db, db_transaction.account_id, db_transaction.amount, False)
-    elif db_transaction.transaction_type == TransactionType.EXPENSE:
-        update_account_balance(db, db_transaction.account_id, db_transaction.amount, True)
-    elif db_transaction.transaction_type == TransactionType.TRANSFER:
-        update_account_balance(db, db_transaction.from_account_id, db_transaction.amount, True)
-        update_account_balance(db, db_transaction.to_account_id, db_transaction.amount, False)
+    deltas = {}
+    add_transaction_balance(deltas, db_transaction, -1)
     
+    apply_balance_changes(db, deltas)
     db.delete(db_transaction)
     db.commit()
     
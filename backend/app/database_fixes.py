@@ -5,10 +5,17 @@ Automatically detects and fixes database schema issues on startup
 
 import sqlite3
 from pathlib import Path
+from typing import Optional
 import logging
 
+from app.database import engine
+
 logger = logging.getLogger(__name__)
 
+# Stored in PRAGMA user_version once every fix below has been applied;
+# bump it when adding a fix so existing databases run the checks again
+SCHEMA_VERSION = 2
+
 
 def get_table_columns(cursor, table_name: str) -> list[str]:
     """Get list of column names for a table"""
@@ -16,7 +23,91 @@ def get_table_columns(cursor, table_name: str) -> list[str]:
     return [row[1] for row in cursor.fetchall()]
 
 
-def fix_budgets_table_schema(db_path: str = "budget.db") -> bool:
+def drop_budgets_category_id(cursor) -> bool:
+    """
+    Drop budgets.category_id in place with ALTER TABLE DROP COLUMN (SQLite 3.35+).
+    
+    SQLite refuses DROP COLUMN on foreign-key columns, and the legacy column is
+    normally declared REFERENCES categories(id); this only helps databases where
+    it was added without the constraint.
+    
+    Returns:
+        bool: False if unsupported or the column is a foreign key,
+        in which case the table has to be rebuilt instead
+    """
+    if sqlite3.sqlite_version_info < (3, 35, 0):
+        return False
+    
+    # (id, seq, table, from, to, ...) per foreign key column
+    cursor.execute("PRAGMA foreign_key_list(budgets)")
+    if "category_id" in [row[3] for row in cursor.fetchall()]:
+        logger.info("  → category_id is a foreign key, rebuilding table")
+        return False
+    
+    try:
+        # SQLite refuses to drop indexed columns, so drop their indexes first
+        cursor.execute("PRAGMA index_list(budgets)")
+        for index_name in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"PRAGMA index_info({index_name})")
+            if "category_id" in [row[2] for row in cursor.fetchall()]:
+                cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        
+        cursor.execute("ALTER TABLE budgets DROP COLUMN category_id")
+    except sqlite3.OperationalError as e:
+        logger.info(f"  → DROP COLUMN not possible ({e}), rebuilding table")
+        return False
+    
+    logger.info("  → Dropped category_id column")
+    return True
+
+
+def rebuild_budgets_table(cursor) -> None:
+    """Recreate the budgets table without category_id by copying every row"""
+    # 1. Create new budgets table without category_id
+    cursor.execute("""
+        CREATE TABLE budgets_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name VARCHAR(100) NOT NULL,
+            amount FLOAT NOT NULL,
+            period_type VARCHAR(9) NOT NULL,
+            start_date DATE NOT NULL,
+            end_date DATE,
+            allow_rollover INTEGER NOT NULL DEFAULT 0,
+            rollover_amount FLOAT NOT NULL DEFAULT 0.0,
+            is_active INTEGER NOT NULL DEFAULT 1,
+            created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            updated_at DATETIME
+        )
+    """)
+    logger.info("  → Created new budgets table")
+    
+    # 2. Copy data from old table to new (excluding category_id)
+    cursor.execute("""
+        INSERT INTO budgets_new 
+            (id, name, amount, period_type, start_date, end_date, 
+             allow_rollover, rollover_amount, is_active, created_at, updated_at)
+        SELECT 
+            id, name, amount, period_type, start_date, end_date,
+            allow_rollover, rollover_amount, is_active, created_at, updated_at
+        FROM budgets
+    """)
+    rows_copied = cursor.rowcount
+    logger.info(f"  → Copied {rows_copied} budget records")
+    
+    # 3. Drop old table
+    cursor.execute("DROP TABLE budgets")
+    logger.info("  → Dropped old budgets table")
+    
+    # 4. Rename new table
+    cursor.execute("ALTER TABLE budgets_new RENAME TO budgets")
+    logger.info("  → Renamed budgets_new to budgets")
+    
+    # 5. Recreate indexes
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_budgets_start_date ON budgets(start_date)")
+    logger.info("  → Recreated indexes")
+
+
+def fix_budgets_table_schema(cursor) -> bool:
     """
     Fix budgets table schema by removing legacy category_id column.
     
@@ -26,99 +117,129 @@ def fix_budgets_table_schema(db_path: str = "budget.db") -> bool:
     Returns:
         bool: True if fix was applied, False if no fix was needed
     """
-    if not Path(db_path).exists():
-        logger.info("Database does not exist yet, skipping schema fixes")
+    # Check if budgets table exists
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='budgets'")
+    if not cursor.fetchone():
+        logger.info("Budgets table does not exist yet, skipping fix")
         return False
     
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    # Check if category_id column exists (this is the problem)
+    columns = get_table_columns(cursor, "budgets")
+    
+    if "category_id" not in columns:
+        logger.info("✓ Budgets table schema is correct (no category_id column)")
+        return False
+    
+    logger.warning("⚠ Detected legacy category_id column in budgets table - applying fix...")
     
+    # Check if budget_categories junction table exists
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='budget_categories'")
+    if not cursor.fetchone():
+        logger.error("✗ budget_categories table missing - cannot apply fix safely")
+        return False
+    
+    # Pooled connections enforce foreign keys; dropping the old budgets table
+    # must not touch the budget_categories rows that reference it
+    cursor.execute("PRAGMA foreign_keys=OFF")
     try:
-        # Check if budgets table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='budgets'")
-        if not cursor.fetchone():
-            logger.info("Budgets table does not exist yet, skipping fix")
-            return False
+        # Start transaction
+        cursor.execute("BEGIN TRANSACTION")
         
-        # Check if category_id column exists (this is the problem)
-        columns = get_table_columns(cursor, "budgets")
+        if not drop_budgets_category_id(cursor):
+            rebuild_budgets_table(cursor)
         
-        if "category_id" not in columns:
-            logger.info("✓ Budgets table schema is correct (no category_id column)")
-            return False
+        # Commit transaction
+        cursor.execute("COMMIT")
+        logger.info("✓ Successfully fixed budgets table schema!")
         
-        logger.warning("⚠ Detected legacy category_id column in budgets table - applying fix...")
+        return True
         
-        # Check if budget_categories junction table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='budget_categories'")
-        if not cursor.fetchone():
-            logger.error("✗ budget_categories table missing - cannot apply fix safely")
+    except Exception as e:
+        cursor.execute("ROLLBACK")
+        logger.error(f"✗ Error fixing budgets table schema: {e}")
+        raise
+    finally:
+        cursor.execute("PRAGMA foreign_keys=ON")
+
+
+def delete_duplicate_keywords(cursor) -> int:
+    """
+    Delete repeated category keywords ahead of making the keyword column unique.
+    Shared by migration 008 and the keyword health check; takes a DB-API cursor.
+    
+    Returns:
+        int: Number of keyword rows removed
+    """
+    # Keep the row the categorizer would have used: active first, then highest priority, then oldest
+    cursor.execute("""
+        DELETE FROM category_keywords
+        WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY keyword
+                    ORDER BY is_active DESC, priority DESC, id
+                ) AS rn
+                FROM category_keywords
+            )
+            WHERE rn = 1
+        )
+    """)
+    removed = cursor.rowcount
+    if removed:
+        # These are user rules, so say how many went
+        logger.warning(f"  → Removed {removed} duplicate category keyword(s)")
+    return removed
+
+
+def fix_keyword_unique_index(cursor) -> bool:
+    """
+    Make category_keywords.keyword unique, as migration 008 does.
+    
+    Keyword inserts rely on ON CONFLICT (keyword), which SQLite rejects without
+    a unique index, so databases the migration never reached are fixed here.
+    
+    Returns:
+        bool: True if fix was applied, False if no fix was needed
+    """
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='category_keywords'")
+    if not cursor.fetchone():
+        return False
+    
+    # (seq, name, unique, origin, partial) per index
+    cursor.execute("PRAGMA index_list(category_keywords)")
+    for index_name in [row[1] for row in cursor.fetchall() if row[2] and not row[4]]:
+        cursor.execute(f"PRAGMA index_info({index_name})")
+        if [row[2] for row in cursor.fetchall()] == ["keyword"]:
+            logger.info("✓ Category keyword index is unique")
             return False
-        
-        # Start transaction
+    
+    logger.warning("⚠ category_keywords.keyword is not unique - applying fix...")
+    try:
         cursor.execute("BEGIN TRANSACTION")
         
-        # 1. Create new budgets table without category_id
-        cursor.execute("""
-            CREATE TABLE budgets_new (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name VARCHAR(100) NOT NULL,
-                amount FLOAT NOT NULL,
-                period_type VARCHAR(9) NOT NULL,
-                start_date DATE NOT NULL,
-                end_date DATE,
-                allow_rollover INTEGER NOT NULL DEFAULT 0,
-                rollover_amount FLOAT NOT NULL DEFAULT 0.0,
-                is_active INTEGER NOT NULL DEFAULT 1,
-                created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME
-            )
-        """)
-        logger.info("  → Created new budgets table")
-        
-        # 2. Copy data from old table to new (excluding category_id)
-        cursor.execute("""
-            INSERT INTO budgets_new 
-                (id, name, amount, period_type, start_date, end_date, 
-                 allow_rollover, rollover_amount, is_active, created_at, updated_at)
-            SELECT 
-                id, name, amount, period_type, start_date, end_date,
-                allow_rollover, rollover_amount, is_active, created_at, updated_at
-            FROM budgets
-        """)
-        rows_copied = cursor.rowcount
-        logger.info(f"  → Copied {rows_copied} budget records")
-        
-        # 3. Drop old table
-        cursor.execute("DROP TABLE budgets")
-        logger.info("  → Dropped old budgets table")
+        delete_duplicate_keywords(cursor)
         
-        # 4. Rename new table
-        cursor.execute("ALTER TABLE budgets_new RENAME TO budgets")
-        logger.info("  → Renamed budgets_new to budgets")
+        cursor.execute("DROP INDEX IF EXISTS ix_category_keywords_keyword")
+        cursor.execute("CREATE UNIQUE INDEX ix_category_keywords_keyword ON category_keywords(keyword)")
         
-        # 5. Recreate indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_budgets_start_date ON budgets(start_date)")
-        logger.info("  → Recreated indexes")
-        
-        # Commit transaction
         cursor.execute("COMMIT")
-        logger.info("✓ Successfully fixed budgets table schema!")
+        logger.info("✓ Made category keywords unique")
         
         return True
         
     except Exception as e:
         cursor.execute("ROLLBACK")
-        logger.error(f"✗ Error fixing budgets table schema: {e}")
+        logger.error(f"✗ Error making category keywords unique: {e}")
         raise
-    finally:
-        conn.close()
 
 
-def run_database_health_checks(db_path: str = "budget.db") -> dict:
+def run_database_health_checks(db_path: Optional[str] = None) -> dict:
     """
     Run all database health checks and fixes.
     
+    Uses a pooled connection from the app engine unless db_path is given, and
+    returns straight away once PRAGMA user_version shows the fixes are in place.
+    
     Returns:
         dict: Summary of fixes applied
     """
@@ -128,17 +249,40 @@ def run_database_health_checks(db_path: str = "budget.db") -> dict:
         "errors": []
     }
     
+    if db_path is not None and not Path(db_path).exists():
+        logger.info("Database does not exist yet, skipping schema fixes")
+        return results
+    
+    conn = sqlite3.connect(db_path) if db_path is not None else engine.raw_connection()
+    cursor = conn.cursor()
+    
     try:
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] >= SCHEMA_VERSION:
+            return results
+        
         # Fix 1: Budgets table schema
         results["checks_run"] += 1
-        if fix_budgets_table_schema(db_path):
+        if fix_budgets_table_schema(cursor):
+            results["fixes_applied"] += 1
+        
+        # Fix 2: Unique keyword index the keyword inserts depend on
+        results["checks_run"] += 1
+        if fix_keyword_unique_index(cursor):
             results["fixes_applied"] += 1
         
         # Add more fixes here as needed in the future
         
+        # Only record the version once the legacy column is really gone
+        if "category_id" not in get_table_columns(cursor, "budgets"):
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        
     except Exception as e:
         results["errors"].append(str(e))
         logger.error(f"Error during database health checks: {e}")
+    finally:
+        cursor.close()
+        conn.close()
     
     return results
 
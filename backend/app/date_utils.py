@@ -0,0 +1,25 @@
+"""Calendar arithmetic shared by the budget and income schedule models"""
+
+import calendar
+from datetime import date
+
+# Days per month in a non-leap year, indexed by month - 1
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def days_in_month(year: int, month: int) -> int:
+    """Number of days in the given month"""
+    if month == 2 and calendar.isleap(year):
+        return 29
+    return _DAYS_IN_MONTH[month - 1]
+
+
+def add_months(d: date, months: int) -> date:
+    """
+    Shift a date by whole months, clamping the day to the target month's length
+    (Jan 31 + 1 month = Feb 28/29), the same as relativedelta(months=...).
+    """
+    total = d.month - 1 + months
+    year = d.year + total // 12
+    month = total % 12 + 1
+    return date(year, month, min(d.day, days_in_month(year, month)))
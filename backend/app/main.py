@@ -3,9 +3,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from pathlib import Path
 import logging
 
-from app.database import engine, Base
+import anyio.to_thread
+
+from app.database import engine, Base, POOL_SIZE, MAX_OVERFLOW
 from app.api import accounts, transactions, categories, budgets, reports, setup, imports, keywords, goals, income_schedules
 
 # Import models to ensure they're registered with Base
@@ -14,6 +17,12 @@ from app.models import account, transaction, category, budget, category_keyword,
 # Import database health checks
 from app.database_fixes import run_database_health_checks
 
+try:
+    import orjson  # noqa: F401 - required by ORJSONResponse
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:  # Fall back to the standard JSON encoder
+    from fastapi.responses import JSONResponse as DefaultJSONResponse
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,12 +30,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# alembic.ini and the migration scripts sit next to the app package, both in the
+# source tree and in the PyInstaller bundle (sys._MEIPASS)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Worker threads for sync endpoints; one per pooled connection so a request
+# thread never blocks waiting for a connection
+THREADPOOL_SIZE = POOL_SIZE + MAX_OVERFLOW
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     logger.info("Starting BudgetingApp backend...")
     
+    # Sync endpoints all contend for the same SQLite file; more threads than
+    # connections only adds GIL and lock churn
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    
     # Startup: Create database tables
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created/verified")
@@ -35,11 +56,14 @@ async def lifespan(app: FastAPI):
     try:
         from alembic.config import Config
         from alembic import command
-        alembic_cfg = Config("alembic.ini")
+        alembic_cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+        # Relative to alembic.ini's folder rather than the working directory
+        alembic_cfg.set_main_option("script_location", str(BACKEND_DIR / "alembic").replace("%", "%%"))
         command.upgrade(alembic_cfg, "head")
         logger.info("Alembic migrations applied")
     except Exception as e:
-        logger.warning(f"Alembic migration skipped: {e}")
+        # Models depend on migrated columns and indexes; make a failure visible
+        logger.error(f"Alembic migration failed: {e}")
     
     # Run database health checks and fixes
     try:
@@ -66,6 +90,7 @@ app = FastAPI(
     description="REST API for desktop budgeting application",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
 )
 
 # CORS middleware for Electron renderer
@@ -75,6 +100,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Health check endpoint
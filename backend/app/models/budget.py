@@ -1,13 +1,20 @@
 """Budget model"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Date, Table
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Date, Table, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from datetime import date, timedelta
-from dateutil.relativedelta import relativedelta
+from typing import NamedTuple
 
 from app.database import Base
+from app.date_utils import add_months
+
+
+class PeriodBoundaries(NamedTuple):
+    """Inclusive first and last day of a budget period"""
+    start: date
+    end: date
 
 
 class BudgetPeriod(str, enum.Enum):
@@ -43,11 +50,11 @@ class Budget(Base):
     end_date = Column(Date, nullable=True)  # Null means ongoing
     
     # Rollover settings
-    allow_rollover = Column(Integer, default=0, nullable=False)  # SQLite boolean
+    allow_rollover = Column(Boolean, default=False, nullable=False)
     rollover_amount = Column(Float, default=0.0, nullable=False)
     
     # Status
-    is_active = Column(Integer, default=1, nullable=False)  # SQLite boolean
+    is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -56,7 +63,7 @@ class Budget(Base):
     # Relationships - many-to-many with categories
     categories = relationship("Category", secondary=budget_categories, backref="budgets")
 
-    def get_period_boundaries(self, reference_date: date = None):
+    def get_period_boundaries(self, reference_date: date = None) -> PeriodBoundaries:
         """Calculate period start and end dates for a given reference date"""
         if reference_date is None:
             reference_date = date.today()
@@ -71,25 +78,25 @@ class Budget(Base):
         elif self.period_type == BudgetPeriod.MONTHLY:
             # Calculate months elapsed since start_date
             months_elapsed = (reference_date.year - self.start_date.year) * 12 + (reference_date.month - self.start_date.month)
-            period_start = self.start_date + relativedelta(months=months_elapsed)
-            period_end = period_start + relativedelta(months=1, days=-1)
+            period_start = add_months(self.start_date, months_elapsed)
+            period_end = add_months(period_start, 1) - timedelta(days=1)
         
         elif self.period_type == BudgetPeriod.QUARTERLY:
             # Calculate quarters elapsed since start_date
             months_elapsed = (reference_date.year - self.start_date.year) * 12 + (reference_date.month - self.start_date.month)
             quarters_elapsed = months_elapsed // 3
-            period_start = self.start_date + relativedelta(months=quarters_elapsed * 3)
-            period_end = period_start + relativedelta(months=3, days=-1)
+            period_start = add_months(self.start_date, quarters_elapsed * 3)
+            period_end = add_months(period_start, 3) - timedelta(days=1)
         
         elif self.period_type == BudgetPeriod.ANNUAL:
             # Calculate years elapsed since start_date
             years_elapsed = reference_date.year - self.start_date.year
             if reference_date < date(reference_date.year, self.start_date.month, self.start_date.day):
                 years_elapsed -= 1
-            period_start = self.start_date + relativedelta(years=years_elapsed)
-            period_end = period_start + relativedelta(years=1, days=-1)
+            period_start = add_months(self.start_date, years_elapsed * 12)
+            period_end = add_months(period_start, 12) - timedelta(days=1)
         
-        return period_start, period_end
+        return PeriodBoundaries(period_start, period_end)
 
     def __repr__(self):
         return f"<Budget(id={self.id}, name='{self.name}', amount={self.amount}, period='{self.period_type}')>"
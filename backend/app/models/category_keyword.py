@@ -1,7 +1,7 @@
 """Category Keyword model for user-defined auto-categorization rules"""
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -18,8 +18,8 @@ class CategoryKeyword(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # The keyword to match against transaction descriptions
-    # Stored lowercase for case-insensitive matching
-    keyword = Column(String(200), nullable=False, index=True)
+    # Stored lowercase for case-insensitive matching; unique so inserts can skip duplicates atomically
+    keyword = Column(String(200), nullable=False, index=True, unique=True)
     
     # The category to assign when keyword matches
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
@@ -47,17 +47,33 @@ class CategoryKeyword(Base):
     def __repr__(self):
         return f"<CategoryKeyword(id={self.id}, keyword='{self.keyword}', category_id={self.category_id})>"
     
+    @validates("keyword")
+    def _lowercase_keyword(self, key, value):
+        """Keep the stored-lowercase invariant for keywords set through the ORM"""
+        return value.lower() if value else value
+    
     def matches(self, text: str) -> bool:
         """Check if this keyword matches the given text."""
-        if not text or not self.is_active:
+        if not text:
+            return False
+        return self.matches_lower(text.lower())
+    
+    def matches_lower(self, text_lower: str) -> bool:
+        """
+        Check against text that is already lowercased, so callers testing one
+        text against many keywords lowercase it once. The keyword itself is
+        stored lowercase and is compared as-is.
+        """
+        if not text_lower or not self.is_active:
             return False
-        
-        text_lower = text.lower()
-        keyword_lower = self.keyword.lower()
         
         if self.match_mode == 'exact':
-            return text_lower == keyword_lower
+            return text_lower == self.keyword
         elif self.match_mode == 'starts_with':
-            return text_lower.startswith(keyword_lower)
+            return text_lower.startswith(self.keyword)
         else:  # 'contains' is default
-            return keyword_lower in text_lower
+            return self.keyword in text_lower
+
+
+# Backs the keyword listing order (priority DESC, keyword) and its keyset pagination
+Index("ix_category_keywords_priority_keyword", CategoryKeyword.priority.desc(), CategoryKeyword.keyword)
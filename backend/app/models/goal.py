@@ -1,6 +1,7 @@
 """Goal model for long-term financial goals"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Date, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Date, Text, case
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -52,35 +53,54 @@ class Goal(Base):
     # Relationships
     account = relationship("Account", backref="goals")
 
-    @property
+    @hybrid_property
     def progress_percentage(self) -> float:
         """Calculate progress percentage"""
         if self.target_amount <= 0:
             return 0.0
         return min((self.current_amount / self.target_amount) * 100, 100.0)
     
-    @property
+    @progress_percentage.expression
+    def progress_percentage(cls):
+        """SQL form, for aggregating progress in the database"""
+        return case(
+            (cls.target_amount <= 0, 0.0),
+            else_=func.min(cls.current_amount / cls.target_amount * 100, 100.0)
+        )
+    
+    @hybrid_property
     def remaining_amount(self) -> float:
         """Calculate remaining amount to reach goal"""
         return max(self.target_amount - self.current_amount, 0.0)
     
-    @property
-    def days_remaining(self) -> int:
-        """Calculate days remaining until target date"""
+    @remaining_amount.expression
+    def remaining_amount(cls):
+        """SQL form, for aggregating remaining amounts in the database"""
+        return func.max(cls.target_amount - cls.current_amount, 0.0)
+    
+    def days_remaining_on(self, today: date) -> int:
+        """Days remaining until target date, as of today"""
         if self.status == GoalStatus.COMPLETED:
             return 0
-        today = date.today()
         if self.target_date < today:
             return 0
         return (self.target_date - today).days
     
-    @property
-    def days_elapsed(self) -> int:
-        """Calculate days elapsed since start date"""
-        today = date.today()
+    def days_elapsed_on(self, today: date) -> int:
+        """Days elapsed since start date, as of today"""
         if today < self.start_date:
             return 0
         return (today - self.start_date).days
+    
+    @property
+    def days_remaining(self) -> int:
+        """Calculate days remaining until target date"""
+        return self.days_remaining_on(date.today())
+    
+    @property
+    def days_elapsed(self) -> int:
+        """Calculate days elapsed since start date"""
+        return self.days_elapsed_on(date.today())
 
     def __repr__(self):
         return f"<Goal(id={self.id}, name='{self.name}', target={self.target_amount}, status='{self.status}')>"
@@ -1,13 +1,13 @@
 """Income Schedule model for recurring income tracking"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Date, Index, Boolean, event, inspect
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from datetime import date, timedelta
-from dateutil.relativedelta import relativedelta
 
 from app.database import Base
+from app.date_utils import add_months, days_in_month
 
 
 class IncomeFrequency(str, enum.Enum):
@@ -23,6 +23,10 @@ class IncomeFrequency(str, enum.Enum):
 class IncomeSchedule(Base):
     """Income schedule for tracking expected recurring income"""
     __tablename__ = "income_schedules"
+    __table_args__ = (
+        # Upcoming income filters active schedules and orders by next date
+        Index("ix_income_schedules_active_next_date", "is_active", "next_expected_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -46,7 +50,7 @@ class IncomeSchedule(Base):
     semimonthly_day2 = Column(Integer, nullable=True)
     
     # Status
-    is_active = Column(Integer, default=1, nullable=False)  # SQLite boolean
+    is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -99,7 +103,7 @@ class IncomeSchedule(Base):
                 pass
             
             # Move to next month, first day
-            next_month = from_date + relativedelta(months=1)
+            next_month = add_months(from_date, 1)
             try:
                 return date(next_month.year, next_month.month, day1)
             except ValueError:
@@ -114,20 +118,20 @@ class IncomeSchedule(Base):
                     return date(from_date.year, from_date.month, day)
                 except ValueError:
                     # Day doesn't exist in this month (e.g., Feb 31)
-                    return date(from_date.year, from_date.month, 1) + relativedelta(months=1, days=-1)
+                    return date(from_date.year, from_date.month, days_in_month(from_date.year, from_date.month))
             else:
                 # Next month
-                next_month = from_date + relativedelta(months=1)
+                next_month = add_months(from_date, 1)
                 try:
                     return date(next_month.year, next_month.month, day)
                 except ValueError:
-                    return date(next_month.year, next_month.month, 1) + relativedelta(months=1, days=-1)
+                    return date(next_month.year, next_month.month, days_in_month(next_month.year, next_month.month))
         
         elif self.frequency == IncomeFrequency.QUARTERLY:
             # Every 3 months
             months_since_start = (from_date.year - self.start_date.year) * 12 + (from_date.month - self.start_date.month)
             quarters_elapsed = months_since_start // 3
-            next_date = self.start_date + relativedelta(months=(quarters_elapsed + 1) * 3)
+            next_date = add_months(self.start_date, (quarters_elapsed + 1) * 3)
             return next_date
         
         elif self.frequency == IncomeFrequency.ANNUAL:
@@ -137,5 +141,31 @@ class IncomeSchedule(Base):
         
         return from_date + timedelta(days=30)  # Fallback
 
+    def reschedule(self, today: date = None):
+        """Point next_expected_date at the first payment on or after today"""
+        if today is None:
+            today = date.today()
+        
+        if self.start_date >= today:
+            self.next_expected_date = self.start_date
+        else:
+            self.next_expected_date = self.calculate_next_date(today - timedelta(days=1))
+
     def __repr__(self):
         return f"<IncomeSchedule(id={self.id}, name='{self.name}', amount={self.amount}, frequency='{self.frequency}')>"
+
+
+# Setting any of these (even to the same value) recomputes next_expected_date
+RESCHEDULE_FIELDS = ("frequency", "start_date", "semimonthly_day1", "semimonthly_day2")
+
+
+@event.listens_for(IncomeSchedule, "before_update")
+def reset_next_expected_date(mapper, connection, target):
+    """Recompute next_expected_date on flush when the recurrence changed or it has passed"""
+    attrs = inspect(target).attrs
+    if attrs.next_expected_date.history.has_changes():
+        # An explicit new date (e.g. advancing after a payment) wins
+        return
+    if (any(attrs[field].history.has_changes() for field in RESCHEDULE_FIELDS)
+            or target.next_expected_date < date.today()):
+        target.reschedule()
@@ -1,6 +1,6 @@
 """Transaction model"""
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Text, Date
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Text, Date, Index, Boolean, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -18,16 +18,33 @@ class TransactionType(str, enum.Enum):
 class Transaction(Base):
     """Transaction model for financial transactions"""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Import duplicate checks filter on exactly these columns; also serves account_id lookups
+        Index("ix_transactions_dup_check", "account_id", "transaction_date", "amount", "transaction_type"),
+        # Report totals by type and date range, grouped by category; amount and account_id
+        # make it covering for the account-filtered reports too
+        Index(
+            "ix_transactions_type_date_category",
+            "transaction_type", "transaction_date", "category_id", "amount", "account_id"
+        ),
+        # Uncategorized rows only, for keyword suggestions and recategorization
+        Index("ix_transactions_uncategorized", "transaction_type", sqlite_where=text("category_id IS NULL")),
+        # Transaction list filters, newest first; each also serves plain lookups on its first column
+        Index("ix_transactions_from_account_date", "from_account_id", "transaction_date"),
+        Index("ix_transactions_to_account_date", "to_account_id", "transaction_date"),
+        # amount makes category + date range totals (budget progress) index-only
+        Index("ix_transactions_category_date", "category_id", "transaction_date", "amount"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     transaction_type = Column(Enum(TransactionType), nullable=False)
     
     # Main account (for income/expense) or source account (for transfers)
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
     
     # Transfer-specific fields
-    from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True, index=True)
-    to_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True, index=True)
+    from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
+    to_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
     
     # Transaction details
     amount = Column(Float, nullable=False)
@@ -36,13 +53,17 @@ class Transaction(Base):
     description = Column(Text, nullable=True)
     
     # Category (null for transfers)
-    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True, index=True)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
     
     # Import tracking
     import_id = Column(String(100), nullable=True, index=True)  # For deduplication
     
+    # Keyword rule-set version this row was last auto-categorized against;
+    # cleared when the fields the rules look at change
+    categorization_version = Column(Integer, nullable=True)
+    
     # Reconciliation
-    is_reconciled = Column(Integer, default=0, nullable=False)  # SQLite doesn't have native boolean
+    is_reconciled = Column(Boolean, default=False, nullable=False)
     reconciled_date = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
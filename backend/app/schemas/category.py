@@ -1,18 +1,39 @@
 """Category schemas"""
 
-from pydantic import BaseModel, Field
+import re
+
+from pydantic import AfterValidator, BaseModel, Field, WithJsonSchema
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List
 
 from app.models.category import CategoryType
 
 
+_COLOR_PATTERN = r'^#[0-9A-Fa-f]{6}$'
+_COLOR_RE = re.compile(_COLOR_PATTERN)
+
+
+def _check_color(v: str) -> str:
+    """Reject colors that are not #RRGGBB hex strings"""
+    if not _COLOR_RE.fullmatch(v):
+        raise ValueError("color must be a hex string like #1A2B3C")
+    return v
+
+
+# Checked with the precompiled regex; the pattern stays in the OpenAPI schema
+HexColor = Annotated[
+    str,
+    AfterValidator(_check_color),
+    WithJsonSchema({"type": "string", "pattern": _COLOR_PATTERN}),
+]
+
+
 class CategoryBase(BaseModel):
     """Base category schema"""
     name: str = Field(..., min_length=1, max_length=100)
     category_type: CategoryType
     parent_id: Optional[int] = None
-    color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
+    color: Optional[HexColor] = None
     icon: Optional[str] = Field(None, max_length=50)
 
 
@@ -24,7 +45,7 @@ class CategoryCreate(CategoryBase):
 class CategoryUpdate(BaseModel):
     """Schema for updating category"""
     name: Optional[str] = Field(None, min_length=1, max_length=100)
-    color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
+    color: Optional[HexColor] = None
     icon: Optional[str] = Field(None, max_length=50)
     is_active: Optional[bool] = None
 
@@ -1,22 +1,23 @@
 """Category Keyword schemas"""
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, StringConstraints
 from datetime import datetime
-from typing import Optional, List, Literal
+from typing import Annotated, Optional, List, Literal
+
+
+# Keywords are stored stripped and lowercased; pydantic-core normalizes them
+# before the length checks, without a Python validator call per keyword
+KeywordText = Annotated[
+    str, StringConstraints(strip_whitespace=True, to_lower=True, min_length=1, max_length=200)
+]
 
 
 class CategoryKeywordBase(BaseModel):
     """Base schema for category keyword"""
-    keyword: str = Field(..., min_length=1, max_length=200)
+    keyword: KeywordText
     category_id: int
     priority: int = Field(default=0, ge=0, le=1000)
     match_mode: Literal['contains', 'starts_with', 'exact'] = 'contains'
-    
-    @field_validator('keyword')
-    @classmethod
-    def normalize_keyword(cls, v: str) -> str:
-        """Normalize keyword to lowercase and strip whitespace"""
-        return v.strip().lower()
 
 
 class CategoryKeywordCreate(CategoryKeywordBase):
@@ -26,19 +27,11 @@ class CategoryKeywordCreate(CategoryKeywordBase):
 
 class CategoryKeywordUpdate(BaseModel):
     """Schema for updating a category keyword"""
-    keyword: Optional[str] = Field(None, min_length=1, max_length=200)
+    keyword: Optional[KeywordText] = None
     category_id: Optional[int] = None
     priority: Optional[int] = Field(None, ge=0, le=1000)
     match_mode: Optional[Literal['contains', 'starts_with', 'exact']] = None
     is_active: Optional[bool] = None
-    
-    @field_validator('keyword')
-    @classmethod
-    def normalize_keyword(cls, v: str | None) -> str | None:
-        """Normalize keyword to lowercase and strip whitespace"""
-        if v is not None:
-            return v.strip().lower()
-        return v
 
 
 class CategoryKeywordResponse(CategoryKeywordBase):
@@ -1,6 +1,6 @@
 """Transaction schemas"""
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime, date
 from typing import Optional
 
@@ -23,39 +23,22 @@ class TransactionCreate(TransactionBase):
     from_account_id: Optional[int] = None  # For transfer
     to_account_id: Optional[int] = None  # For transfer
 
-    @validator('category_id')
-    def validate_category(cls, v, values):
-        """Category required for income/expense"""
-        if values.get('transaction_type') in [TransactionType.INCOME, TransactionType.EXPENSE]:
-            if v is None:
-                raise ValueError('category_id required for income/expense transactions')
-        return v
-
-    @validator('account_id')
-    def validate_account(cls, v, values):
-        """Account required for income/expense"""
-        if values.get('transaction_type') in [TransactionType.INCOME, TransactionType.EXPENSE]:
-            if v is None:
-                raise ValueError('account_id required for income/expense transactions')
-        return v
-
-    @validator('from_account_id')
-    def validate_from_account(cls, v, values):
-        """From account required for transfer"""
-        if values.get('transaction_type') == TransactionType.TRANSFER:
-            if v is None:
+    @model_validator(mode='after')
+    def validate_references(self) -> 'TransactionCreate':
+        """Income/expense need an account and category; transfers need two different accounts"""
+        if self.transaction_type == TransactionType.TRANSFER:
+            if self.from_account_id is None:
                 raise ValueError('from_account_id required for transfer transactions')
-        return v
-
-    @validator('to_account_id')
-    def validate_to_account(cls, v, values):
-        """To account required for transfer"""
-        if values.get('transaction_type') == TransactionType.TRANSFER:
-            if v is None:
+            if self.to_account_id is None:
                 raise ValueError('to_account_id required for transfer transactions')
-            if v == values.get('from_account_id'):
+            if self.to_account_id == self.from_account_id:
                 raise ValueError('from_account_id and to_account_id must be different')
-        return v
+        else:
+            if self.account_id is None:
+                raise ValueError('account_id required for income/expense transactions')
+            if self.category_id is None:
+                raise ValueError('category_id required for income/expense transactions')
+        return self
 
 
 class TransactionUpdate(BaseModel):
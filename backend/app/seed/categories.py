@@ -1,6 +1,10 @@
 """Preset category seed data"""
 
-from app.models.category import CategoryType
+from types import MappingProxyType
+
+from sqlalchemy import insert
+
+from app.models.category import Category, CategoryType
 
 # Two-level hierarchical preset categories
 PRESET_CATEGORIES = [
@@ -190,6 +194,60 @@ PRESET_CATEGORIES = [
 ]
 
 
+def _freeze(cat_data):
+    """Read-only view of a preset entry, with its subcategories frozen too"""
+    frozen = dict(cat_data)
+    frozen["subcategories"] = tuple(
+        MappingProxyType(dict(subcat_data)) for subcat_data in cat_data.get("subcategories", [])
+    )
+    return MappingProxyType(frozen)
+
+
+# Built once at import and shared by every caller, so nothing can mutate the presets
+PRESET_CATEGORIES = tuple(_freeze(cat_data) for cat_data in PRESET_CATEGORIES)
+
+
 def get_preset_categories():
-    """Return preset categories for seeding"""
+    """Return preset categories for seeding (a tuple of read-only mappings)"""
     return PRESET_CATEGORIES
+
+
+def _category_row(name, cat_data, item):
+    """Category column values for a preset entry; type and system flag come from the parent"""
+    return MappingProxyType({
+        "name": name,
+        "category_type": cat_data["category_type"],
+        "is_system": cat_data["is_system"],
+        "color": item.get("color"),
+        "icon": item.get("icon"),
+        "is_active": True,
+    })
+
+
+# Insert rows flattened once at import: parents in order, then (parent index, row) per subcategory
+PRESET_PARENT_ROWS = tuple(
+    _category_row(cat_data["name"], cat_data, cat_data) for cat_data in PRESET_CATEGORIES
+)
+PRESET_CHILD_ROWS = tuple(
+    (parent_index, _category_row(subcat_data["name"], cat_data, subcat_data))
+    for parent_index, cat_data in enumerate(PRESET_CATEGORIES)
+    for subcat_data in cat_data.get("subcategories", ())
+)
+
+
+def insert_preset_categories(db) -> int:
+    """Insert the preset categories in two statements and return how many were created"""
+    parent_ids = db.execute(
+        insert(Category).returning(Category.id, sort_by_parameter_order=True),
+        [dict(row) for row in PRESET_PARENT_ROWS]
+    ).scalars().all()
+    
+    # Only the parent ids vary between runs
+    children = [
+        {**row, "parent_id": parent_ids[parent_index]}
+        for parent_index, row in PRESET_CHILD_ROWS
+    ]
+    if children:
+        db.execute(insert(Category), children)
+    
+    return len(parent_ids) + len(children)
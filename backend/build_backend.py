@@ -61,9 +61,13 @@ def build_executable():
         "--hidden-import", "uvicorn.logging",
         "--hidden-import", "uvicorn.loops",
         "--hidden-import", "uvicorn.loops.auto",
+        "--hidden-import", "uvicorn.loops.uvloop",
+        "--hidden-import", "uvloop",  # Not available on Windows; PyInstaller just warns
         "--hidden-import", "uvicorn.protocols",
         "--hidden-import", "uvicorn.protocols.http",
         "--hidden-import", "uvicorn.protocols.http.auto",
+        "--hidden-import", "uvicorn.protocols.http.httptools_impl",
+        "--hidden-import", "httptools",
         "--hidden-import", "uvicorn.protocols.websockets",
         "--hidden-import", "uvicorn.protocols.websockets.auto",
         "--hidden-import", "uvicorn.lifespan",
@@ -71,9 +75,12 @@ def build_executable():
         "--hidden-import", "uvicorn.lifespan.off",
         "--hidden-import", "sqlalchemy.sql.default_comparator",
         "--hidden-import", "sqlalchemy.dialects.sqlite",
-        "--hidden-import", "pandas._libs.tslibs.timedeltas",
-        "--hidden-import", "pandas._libs.tslibs.nattype",
-        "--hidden-import", "pandas._libs.tslibs.np_datetime",
+        "--hidden-import", "ahocorasick",
+        "--hidden-import", "orjson",
+        # The app never imports these; keep them out of the bundle
+        "--exclude-module", "pandas",
+        "--exclude-module", "numpy",
+        "--exclude-module", "tkinter",
         # Add data files
         "--add-data", f"alembic.ini{os.pathsep}.",
         "--add-data", f"alembic{os.pathsep}alembic",
@@ -83,6 +90,10 @@ def build_executable():
         "backend_entry.py"
     ]
     
+    # Strip symbols from bundled binaries (needs the binutils strip, so not on Windows)
+    if sys.platform != "win32":
+        cmd.insert(-1, "--strip")
+    
     # Run PyInstaller
     subprocess.check_call(cmd, cwd=str(BACKEND_DIR))
     
@@ -0,0 +1,24 @@
+"""CSV import parsing tests"""
+
+import io
+from datetime import date
+
+from app.api.imports import parse_csv_file
+
+
+def test_requested_date_format_wins_for_ambiguous_rows():
+    """A day-first row early in the file must not change how later ambiguous rows are read"""
+    stream = io.StringIO(
+        "Date,Description,Amount\n"
+        "15/01/2024,Coffee,-3.50\n"
+        "03/02/2024,Groceries,-42.10\n"
+        "02/28/2024,Salary,1500.00\n"
+    )
+    
+    transactions = parse_csv_file(stream, date_format="%m/%d/%Y")
+    
+    assert [t.transaction_date for t in transactions] == [
+        date(2024, 1, 15),  # Only valid day-first, so the fallback parses it
+        date(2024, 3, 2),   # Ambiguous: read with the requested month-first format
+        date(2024, 2, 28),
+    ]
@@ -1245,7 +1245,11 @@ const Categories: React.FC = () => {
                 )}
               </>
             ) : (
-              <Empty description="No transactions would be changed" />
+              <Empty
+                description={recategorizeResult.processed === 0 && recategorizeResult.skipped > 0
+                  ? recategorizeResult.message
+                  : "No transactions would be changed"}
+              />
             )}
 
             {!recategorizeResult.dry_run && (